@@ -1,39 +1,548 @@
 import json
 import os
 import re
+import time
+import random
+import heapq
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import httpx
 from dotenv import load_dotenv
 
+import metrics
+
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"))
 
 CEREBRAS_API_KEY = os.getenv("CEREBRAS_API_KEY", "")
-CEREBRAS_API_URL = "https://api.cerebras.ai/v1/chat/completions"
+# Any OpenAI-compatible endpoint works, e.g. benchmarks/mock_llm.py for offline load tests
+CEREBRAS_BASE_URL = os.getenv("CEREBRAS_BASE_URL", "https://api.cerebras.ai/v1").rstrip("/")
+CEREBRAS_API_URL = f"{CEREBRAS_BASE_URL}/chat/completions"
+CEREBRAS_MODEL = os.getenv("CEREBRAS_MODEL", "llama-3.3-70b")
+
+# Upper bound on concurrent Cerebras requests across the whole process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+# Provider quota shared by every caller (0 disables that limit)
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "60000"))
+
+# Scheduling classes, most urgent first; callers waiting for quota are served in this order
+PRIORITY_CLASSES = ["interview", "evaluation", "prefetch", "report", "bulk"]
+PURPOSE_PRIORITY = {
+    "interview_question": "interview",
+    "interview_evaluation": "evaluation",
+    # Speculative next questions must not delay live turns
+    "interview_prefetch": "prefetch",
+    "report": "report",
+    "mcq": "bulk",
+    "coding": "bulk",
+}
+
+# Retry / hedging / circuit breaker settings for Cerebras calls
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+# Send a duplicate interview request if the first has not answered after this long (0 disables)
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+llm_latency = metrics.histogram("llm_request_seconds", "Cerebras request latency by purpose and outcome")
+llm_prompt_tokens = metrics.counter("llm_prompt_tokens_total", "Prompt tokens reported by Cerebras usage")
+llm_completion_tokens = metrics.counter("llm_completion_tokens_total", "Completion tokens reported by Cerebras usage")
+llm_parse_failures = metrics.counter("llm_parse_failures_total", "LLM responses that did not contain parseable JSON")
+llm_fallbacks = metrics.counter("llm_fallbacks_total", "Times a built-in fallback replaced LLM output")
+llm_retries = metrics.counter("llm_retries_total", "Cerebras requests retried after a transient failure")
+llm_hedges = metrics.counter("llm_hedged_requests_total", "Duplicate Cerebras requests sent to cut tail latency")
+llm_circuit_open = metrics.gauge("llm_circuit_open", "1 while the Cerebras circuit breaker is open")
+llm_queue_wait = metrics.histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited for a concurrency slot and rate-limit quota, by priority",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+llm_queue_depth = metrics.gauge("llm_queue_depth", "LLM calls waiting in the scheduler, by priority")
+
+
+class TokenBucket:
+    """Classic token bucket: holds up to `per_minute` units, refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        if not self.enabled or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if self.enabled:
+            self.level -= amount
+
+    def give_back(self, amount: float):
+        if self.enabled:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class LLMScheduler:
+    """Admits LLM calls by priority within concurrency, requests/min and tokens/min limits.
+
+    Waiters queue in (priority, arrival) order and only the head of the queue
+    can be admitted, so a backlog of bulk generation never overtakes a live
+    interview turn. Token reservations are prompt estimate + max_tokens
+    (clamped to the bucket size) and are corrected to the provider's reported
+    usage when the call finishes.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int, tokens_per_minute: int):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._active = 0
+        self._waiters = []  # heap of (priority, seq, future, tokens)
+        self._seq = 0
+        self._timer = None  # loop.call_later handle for the next refill check
+
+    def _reservation(self, tokens: int) -> float:
+        return min(float(tokens), self.tokens.capacity) if self.tokens.enabled else 0.0
+
+    def _dispatch(self):
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        while self._waiters:
+            _, _, future, tokens = self._waiters[0]
+            if future.done():  # cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self.max_concurrency:
+                return
+            wait = max(self.requests.seconds_until(1), self.tokens.seconds_until(tokens))
+            if wait > 0:
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._active += 1
+            future.set_result(None)
+
+    def _wake_in(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._timer is not None:
+            if self._timer.when() <= loop.time() + delay:
+                return
+            self._timer.cancel()
+
+        def wake():
+            self._timer = None
+            self._dispatch()
+        self._timer = loop.call_later(delay, wake)
+
+    @asynccontextmanager
+    async def slot(self, purpose: str, tokens: int):
+        """Hold a scheduled slot for one request. Set lease["tokens"] to the actual usage when known."""
+        priority = PURPOSE_PRIORITY.get(purpose, "report")
+        reserved = self._reservation(tokens)
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        entry = (PRIORITY_CLASSES.index(priority), self._seq, future, reserved)
+        heapq.heappush(self._waiters, entry)
+        llm_queue_depth.inc(priority=priority)
+        started = time.monotonic()
+        try:
+            self._dispatch()
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(reserved, 0)  # admitted just as we were cancelled
+            else:
+                # Leave the queue now; whoever was behind us may be admissible already
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._dispatch()
+            raise
+        finally:
+            llm_queue_depth.dec(priority=priority)
+            llm_queue_wait.observe(time.monotonic() - started, priority=priority)
+
+        lease = {"tokens": None}
+        try:
+            yield lease
+        finally:
+            used = reserved if lease["tokens"] is None else lease["tokens"]
+            self._release(reserved, used)
+
+    def _release(self, reserved: float, used: float):
+        self._active -= 1
+        self.tokens.give_back(reserved - used)
+        if reserved < used:
+            self.tokens.take(used - reserved)
+        self._dispatch()
+
+
+_scheduler = LLMScheduler(LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+
+
+def _request_token_estimate(payload: dict) -> int:
+    prompt = sum(len(m.get("content") or "") for m in payload["messages"])
+    return (prompt + 3) // 4 + payload["max_tokens"]
+
+
+def _usage_tokens(usage: dict):
+    if not usage:
+        return None
+    return usage.get("total_tokens") or (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+
+
+class LLMUnavailable(Exception):
+    """Raised without calling Cerebras while the circuit breaker is open or no API key is set."""
+
+
+# What a Cerebras call raises when the model could not be reached at all, as
+# opposed to answering with something unusable
+LLM_ERRORS = (LLMUnavailable, httpx.HTTPError)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After failure_threshold transient failures in a row the circuit opens and
+    calls fail fast with LLMUnavailable, so callers go straight to their
+    fallbacks. Once reset_seconds have passed a single trial call is let
+    through; its outcome closes the circuit or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def before_call(self):
+        if self.opened_at is None:
+            return
+        if time.monotonic() - self.opened_at < self.reset_seconds or self._trial_in_flight:
+            raise LLMUnavailable("Cerebras circuit breaker is open")
+        self._trial_in_flight = True
+
+    def release_trial(self):
+        """The call ended without an outcome (cancelled); let the next call be the trial."""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print("Cerebras circuit breaker closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        llm_circuit_open.set(0)
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                print(f"Cerebras circuit breaker opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+            llm_circuit_open.set(1)
+
+
+_breaker = CircuitBreaker(LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS)
+
 
+def _record_usage(purpose: str, usage: dict):
+    if usage:
+        llm_prompt_tokens.inc(usage.get("prompt_tokens") or 0, purpose=purpose)
+        llm_completion_tokens.inc(usage.get("completion_tokens") or 0, purpose=purpose)
 
-async def call_cerebras(messages: list, temperature: float = 0.7, max_tokens: int = 4096) -> str:
-    """Call Cerebras API for text generation."""
+
+def _record_fallback(purpose: str, reason: str):
+    llm_fallbacks.inc(purpose=purpose, reason=reason)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def _retry_after_seconds(error: Exception):
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP-date), if any."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    value = error.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _retry_delay(error: Exception, attempt: int):
+    """Delay before the next attempt, or None if the server asked us to wait too long.
+
+    Uses Retry-After when the server sends it, otherwise full-jitter
+    exponential backoff capped at LLM_RETRY_MAX_SECONDS.
+    """
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None:
+        return retry_after if retry_after <= LLM_RETRY_MAX_SECONDS else None
+    return random.uniform(0, min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * (2 ** attempt)))
+
+
+def _cerebras_request(messages: list, temperature: float, max_tokens: int, stream: bool = False):
     if not CEREBRAS_API_KEY:
         # Raise error to trigger fallback mechanism in caller functions
-        raise ValueError("CEREBRAS_API_KEY is not set")
-
+        raise LLMUnavailable("CEREBRAS_API_KEY is not set")
     headers = {
         "Authorization": f"Bearer {CEREBRAS_API_KEY}",
         "Content-Type": "application/json",
     }
     payload = {
-        "model": "llama-3.3-70b",
+        "model": CEREBRAS_MODEL,
         "messages": messages,
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
+    if stream:
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+    return headers, payload
+
+
+def _http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0))
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.post(CEREBRAS_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+
+async def _completion_attempt(headers: dict, payload: dict, purpose: str) -> dict:
+    """One POST to Cerebras, holding a scheduler slot for its duration."""
+    async with _scheduler.slot(purpose, _request_token_estimate(payload)) as lease:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async with _http_client() as client:
+                response = await client.post(CEREBRAS_API_URL, json=payload, headers=headers)
+                response.raise_for_status()
+                data = response.json()
+            outcome = "ok"
+            lease["tokens"] = _usage_tokens(data.get("usage"))
+            return data
+        finally:
+            llm_latency.observe(time.perf_counter() - started, purpose=purpose, outcome=outcome)
+
+
+async def _hedged_completion(headers: dict, payload: dict, purpose: str, hedge_after: float) -> dict:
+    """Start a second identical request if the first is slow; use whichever succeeds first."""
+    tasks = [asyncio.create_task(_completion_attempt(headers, payload, purpose))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            llm_hedges.inc(purpose=purpose)
+            tasks.append(asyncio.create_task(_completion_attempt(headers, payload, purpose)))
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_cerebras(
+    messages: list,
+    temperature: float = 0.7,
+    max_tokens: int = 4096,
+    purpose: str = "other",
+    hedge_after: float = None
+) -> str:
+    """Call Cerebras API for text generation.
+
+    Transient failures (timeouts, 429 and 5xx) are retried with backoff and
+    feed the circuit breaker. purpose labels the call's metrics; hedge_after
+    enables a duplicate request after that many seconds.
+    """
+    headers, payload = _cerebras_request(messages, temperature, max_tokens)
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        _breaker.before_call()
+        try:
+            if hedge_after:
+                data = await _hedged_completion(headers, payload, purpose, hedge_after)
+            else:
+                data = await _completion_attempt(headers, payload, purpose)
+        except (asyncio.CancelledError, GeneratorExit):
+            _breaker.release_trial()
+            raise
+        except Exception as e:
+            if not _is_retryable(e):
+                _breaker.record_success()  # the provider answered; the request itself was bad
+                raise
+            _breaker.record_failure()
+            delay = _retry_delay(e, attempt)
+            if attempt == LLM_MAX_RETRIES or delay is None:
+                raise
+            print(f"Cerebras call ({purpose}) failed: {e}; retrying in {delay:.1f}s")
+            llm_retries.inc(purpose=purpose)
+            await asyncio.sleep(delay)
+            continue
+        _breaker.record_success()
+        _record_usage(purpose, data.get("usage"))
         return data["choices"][0]["message"]["content"]
 
 
+async def _stream_attempt(headers: dict, payload: dict, purpose: str):
+    async with _scheduler.slot(purpose, _request_token_estimate(payload)) as lease:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async with _http_client() as client:
+                async with client.stream("POST", CEREBRAS_API_URL, json=payload, headers=headers) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        try:
+                            event = json.loads(data)
+                        except json.JSONDecodeError:
+                            continue
+                        if event.get("usage"):
+                            _record_usage(purpose, event["usage"])
+                            lease["tokens"] = _usage_tokens(event["usage"])
+                        choices = event.get("choices") or []
+                        if choices:
+                            content = (choices[0].get("delta") or {}).get("content")
+                            if content:
+                                yield content
+            outcome = "ok"
+        finally:
+            llm_latency.observe(time.perf_counter() - started, purpose=purpose, outcome=outcome)
+
+
+async def stream_cerebras(messages: list, temperature: float = 0.7, max_tokens: int = 4096, purpose: str = "other"):
+    """Stream a Cerebras completion, yielding content deltas as they arrive (SSE).
+
+    Retries like call_cerebras, but only until the first delta has been
+    yielded; a stream that breaks midway raises to the caller.
+    """
+    headers, payload = _cerebras_request(messages, temperature, max_tokens, stream=True)
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        _breaker.before_call()
+        yielded = False
+        try:
+            async for content in _stream_attempt(headers, payload, purpose):
+                yielded = True
+                yield content
+        except (asyncio.CancelledError, GeneratorExit):
+            _breaker.release_trial()
+            raise
+        except Exception as e:
+            if not _is_retryable(e):
+                _breaker.record_success()
+                raise
+            _breaker.record_failure()
+            delay = _retry_delay(e, attempt)
+            if yielded or attempt == LLM_MAX_RETRIES or delay is None:
+                raise
+            print(f"Cerebras stream ({purpose}) failed: {e}; retrying in {delay:.1f}s")
+            llm_retries.inc(purpose=purpose)
+            await asyncio.sleep(delay)
+            continue
+        _breaker.record_success()
+        return
+
+
+class JsonStringFieldExtractor:
+    """Incrementally pull one top-level string field out of streamed JSON text.
+
+    feed() accepts raw chunks of the model's output (which may wrap the JSON
+    in a code fence) and returns the newly decoded characters of the field's
+    value, so it can be forwarded before the JSON document is complete.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, field: str):
+        self._start = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = None  # index just past the last consumed character of the value
+        self._done = False
+        self._decoded = []
+
+    def feed(self, chunk: str) -> str:
+        if self._done:
+            return ""
+        self._buffer += chunk
+        if self._pos is None:
+            match = self._start.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        out = []
+        buf, i = self._buffer, self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._done = True
+                i += 1
+                break
+            if ch == "\\":
+                if i + 1 >= len(buf):
+                    break  # wait for the rest of the escape
+                esc = buf[i + 1]
+                if esc == "u":
+                    if i + 6 > len(buf):
+                        break
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(self._ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        self._pos = i
+        text = "".join(out)
+        self._decoded.append(text)
+        return text
+
+    def value(self) -> str:
+        return "".join(self._decoded)
+
+
 def parse_json_response(text: str) -> any:
     """Extract JSON from AI response text."""
     # Try to find JSON in code blocks
@@ -62,6 +571,14 @@ def parse_json_response(text: str) -> any:
     return None
 
 
+def _parse_llm_json(text: str, purpose: str):
+    """parse_json_response, counting responses with no usable JSON."""
+    result = parse_json_response(text)
+    if result is None:
+        llm_parse_failures.inc(purpose=purpose)
+    return result
+
+
 async def generate_mcq_questions(skills: list, count: int = 20) -> list:
     """Generate MCQ questions based on candidate skills."""
     skills_str = ", ".join(skills[:15])  # Limit to top 15 skills
@@ -96,14 +613,16 @@ Return ONLY a valid JSON array."""
     ]
 
     try:
-        response = await call_cerebras(messages, temperature=0.7, max_tokens=8000)
+        response = await call_cerebras(messages, temperature=0.7, max_tokens=8000, purpose="mcq")
     except Exception as e:
         print(f"Cerebras API call failed: {e}")
+        _record_fallback("mcq", "api_error")
         return generate_fallback_mcq(skills, count)
-    questions = parse_json_response(response)
+    questions = _parse_llm_json(response, "mcq")
 
     if not questions or not isinstance(questions, list):
         # Fallback: generate simpler questions
+        _record_fallback("mcq", "invalid_response")
         return generate_fallback_mcq(skills, count)
 
     # Validate and clean questions
@@ -115,7 +634,10 @@ Return ONLY a valid JSON array."""
                 q["options"] = q["options"][:4]
                 valid_questions.append(q)
 
-    return valid_questions if valid_questions else generate_fallback_mcq(skills, count)
+    if not valid_questions:
+        _record_fallback("mcq", "no_valid_questions")
+        return generate_fallback_mcq(skills, count)
+    return valid_questions
 
 
 def generate_fallback_mcq(skills: list, count: int) -> list:
@@ -183,10 +705,16 @@ Return ONLY a valid JSON array."""
         }
     ]
 
-    response = await call_cerebras(messages, temperature=0.7, max_tokens=6000)
-    problems = parse_json_response(response)
+    try:
+        response = await call_cerebras(messages, temperature=0.7, max_tokens=6000, purpose="coding")
+    except Exception as e:
+        print(f"Cerebras API call failed: {e}")
+        _record_fallback("coding", "api_error")
+        return generate_fallback_coding_problems(skills)
+    problems = _parse_llm_json(response, "coding")
 
     if not problems or not isinstance(problems, list):
+        _record_fallback("coding", "invalid_response")
         return generate_fallback_coding_problems(skills)
 
     return problems
@@ -252,22 +780,158 @@ def generate_fallback_coding_problems(skills: list) -> list:
     ]
 
 
-async def generate_interview_question(
+# Approximate token budget for the resume + history part of each interview prompt.
+# Half goes to the resume digest, which at the default stays under the legacy
+# 1500-character resume slice (~375 tokens).
+INTERVIEW_PROMPT_TOKEN_BUDGET = int(os.getenv("INTERVIEW_PROMPT_TOKEN_BUDGET", "600"))
+
+_RESUME_SIGNAL_WORDS = (
+    "experience", "project", "intern", "engineer", "developer", "developed", "built",
+    "implemented", "designed", "led", "achievement", "award", "published", "certif",
+)
+
+prompt_tokens_total = metrics.counter(
+    "interview_prompt_tokens_total", "Estimated prompt tokens sent for interview question generation")
+prompt_tokens_saved_total = metrics.counter(
+    "interview_prompt_tokens_saved_total", "Estimated prompt tokens saved by interview context compaction")
+prompt_tokens_added_total = metrics.counter(
+    "interview_prompt_tokens_added_total",
+    "Estimated prompt tokens added by interview context compaction where it was larger than the legacy prompt")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def build_resume_digest(resume_text: str, skills: list, max_tokens: int = None) -> str:
+    """Condense a resume to the lines most useful for interview questions.
+
+    Lines mentioning the candidate's skills or experience/project wording are
+    kept in their original order until the token budget is used up.
+    """
+    max_chars = (max_tokens or INTERVIEW_PROMPT_TOKEN_BUDGET // 2) * 4
+    skill_set = {s.lower() for s in skills}
+    scored, seen = [], set()
+    for position, raw in enumerate((resume_text or "").splitlines()):
+        line = " ".join(raw.split())
+        key = line.lower()
+        if len(line) < 12 or key in seen:
+            continue
+        seen.add(key)
+        words = set(re.split(r"[^a-z0-9+#.\-]+", key))
+        score = 2 * len(words & skill_set) + sum(1 for w in _RESUME_SIGNAL_WORDS if w in key)
+        if score:
+            scored.append((score, position, _clip(line, 240)))
+
+    picked, used = [], 0
+    for score, position, line in sorted(scored, key=lambda t: (-t[0], t[1])):
+        if used + len(line) + 1 > max_chars:
+            continue
+        picked.append((position, line))
+        used += len(line) + 1
+    if not picked:
+        return _clip(resume_text or "", max_chars)
+    return "\n".join(line for _, line in sorted(picked))
+
+
+def summarize_interview_turn(qa: dict, number: int) -> str:
+    """One-line summary of an answered turn for the rolling interview context."""
+    data = qa.get("question_data") or {}
+    line = f"Q{number} [{data.get('category', 'general')}, {data.get('difficulty', 'medium')}] {_clip(qa.get('question', ''), 140)}"
+    if qa.get("score") is not None:
+        line += f" -> {qa['score']}/10"
+    covered = (qa.get("evaluation") or {}).get("key_points_covered") or []
+    if covered:
+        line += f"; covered: {_clip(', '.join(str(c) for c in covered[:3]), 120)}"
+    return line
+
+
+def legacy_interview_history(previous_qa: list) -> str:
+    if not previous_qa:
+        return ""
+    return "\n".join([
+        f"Q{i+1}: {qa.get('question', '')}\nA{i+1}: {qa.get('answer', '')}\nScore: {qa.get('score') if qa.get('score') is not None else 'N/A'}/10"
+        for i, qa in enumerate(previous_qa[-3:])  # Last 3 Q&A for context
+    ])
+
+
+def compact_interview_history(previous_qa: list, summary_lines: list, max_tokens: int) -> str:
+    """Most recent Q&A in full plus one-line summaries of earlier turns.
+
+    Summaries come from the interview's cached context_summary; any turn not
+    yet cached is summarised on the fly. The oldest summaries are dropped
+    first when the history would exceed max_tokens.
+    """
+    if not previous_qa:
+        return ""
+    n = len(previous_qa)
+    recent = previous_qa[-1]
+    recent_text = f"Q{n}: {_clip(recent.get('question', ''), 400)}\nA{n}: {_clip(recent.get('answer') or '', 800)}"
+    if recent.get("score") is not None:
+        recent_text += f"\nScore: {recent['score']}/10"
+
+    earlier = [
+        summary_lines[i] if i < len(summary_lines) else summarize_interview_turn(previous_qa[i], i + 1)
+        for i in range(n - 1)
+    ]
+    while earlier and estimate_tokens("\n".join(earlier) + recent_text) > max_tokens:
+        earlier.pop(0)
+
+    parts = []
+    if earlier:
+        parts.append("Earlier questions (summary):\n" + "\n".join(earlier))
+    parts.append("Most recent:\n" + recent_text)
+    return "\n\n".join(parts)
+
+
+def _record_prompt_compaction(messages: list, legacy_messages: list):
+    used = sum(estimate_tokens(m["content"]) for m in messages)
+    baseline = sum(estimate_tokens(m["content"]) for m in legacy_messages)
+    prompt_tokens_total.inc(used)
+    # Record both directions so a compacted prompt that grew is visible
+    if used <= baseline:
+        prompt_tokens_saved_total.inc(baseline - used)
+    else:
+        prompt_tokens_added_total.inc(used - baseline)
+
+
+def build_interview_question_messages(
     skills: list,
     resume_text: str,
     previous_qa: list,
     question_number: int,
     total_questions: int,
     github_url: str = "",
-    coding_platforms: dict = None
-) -> dict:
-    """Generate a single AI interview question based on context."""
-    prev_context = ""
-    if previous_qa:
-        prev_context = "\n".join([
-            f"Q{i+1}: {qa.get('question', '')}\nA{i+1}: {qa.get('answer', '')}\nScore: {qa.get('score', 'N/A')}/10"
-            for i, qa in enumerate(previous_qa[-3:])  # Last 3 Q&A for context
-        ])
+    coding_platforms: dict = None,
+    resume_digest: str = None,
+    context_summary: list = None
+) -> list:
+    """Build the chat messages used to generate one interview question.
+
+    When a resume_digest is supplied the prompt is compacted: the digest
+    replaces the raw resume and older turns are sent as one-line summaries
+    (see compact_interview_history) within INTERVIEW_PROMPT_TOKEN_BUDGET,
+    and never beyond the size of the legacy last-three-turns history.
+    """
+    if resume_digest is not None:
+        resume_label, resume_block = "Resume Digest", resume_digest
+        legacy_context = legacy_interview_history(previous_qa)
+        history_budget = min(
+            max(INTERVIEW_PROMPT_TOKEN_BUDGET - estimate_tokens(resume_digest), 100),
+            estimate_tokens(legacy_context),
+        )
+        prev_context = compact_interview_history(previous_qa, context_summary or [], history_budget)
+        if len(prev_context) > len(legacy_context):
+            prev_context = legacy_context
+    else:
+        resume_label, resume_block = "Resume Summary (key parts)", resume_text[:1500]
+        prev_context = legacy_interview_history(previous_qa)
 
     platform_info = ""
     if coding_platforms:
@@ -301,8 +965,8 @@ Return a JSON object with:
 {github_info}
 {platform_info}
 
-Resume Summary (key parts):
-{resume_text[:1500]}
+{resume_label}:
+{resume_block}
 
 Question {question_number} of {total_questions}.
 
@@ -318,31 +982,128 @@ Return ONLY valid JSON."""
         }
     ]
 
+    return messages
+
+
+def _interview_question_messages(skills, resume_text, previous_qa, question_number, total_questions,
+                                 github_url, coding_platforms, resume_digest, context_summary) -> list:
+    messages = build_interview_question_messages(
+        skills, resume_text, previous_qa, question_number, total_questions, github_url, coding_platforms,
+        resume_digest, context_summary
+    )
+    if resume_digest is not None:
+        legacy = build_interview_question_messages(
+            skills, resume_text, previous_qa, question_number, total_questions, github_url, coding_platforms
+        )
+        _record_prompt_compaction(messages, legacy)
+    else:
+        prompt_tokens_total.inc(sum(estimate_tokens(m["content"]) for m in messages))
+    return messages
+
+
+def fallback_interview_question(skills: list, question_number: int, reason: str = "Fallback question") -> dict:
+    return {
+        "question": f"Can you explain your experience with {skills[question_number % len(skills)]} and describe a project where you used it?",
+        "category": skills[question_number % len(skills)],
+        "difficulty": "medium",
+        "expected_key_points": ["Technical depth", "Practical experience", "Problem-solving approach"],
+        "follow_up_context": reason
+    }
+
+
+async def generate_interview_question(
+    skills: list,
+    resume_text: str,
+    previous_qa: list,
+    question_number: int,
+    total_questions: int,
+    github_url: str = "",
+    coding_platforms: dict = None,
+    resume_digest: str = None,
+    context_summary: list = None,
+    purpose: str = "interview_question"
+) -> dict:
+    """Generate a single AI interview question based on context.
+
+    purpose="interview_prefetch" schedules a speculative question below live
+    interview calls, without hedging.
+    """
+    messages = _interview_question_messages(
+        skills, resume_text, previous_qa, question_number, total_questions, github_url, coding_platforms,
+        resume_digest, context_summary
+    )
+
     try:
-        response = await call_cerebras(messages, temperature=0.8, max_tokens=2000)
+        response = await call_cerebras(
+            messages, temperature=0.8, max_tokens=2000, purpose=purpose,
+            hedge_after=LLM_HEDGE_AFTER_SECONDS if purpose == "interview_question" else None
+        )
     except Exception as e:
         print(f"Cerebras API call failed: {e}")
-        return {
-            "question": f"Can you explain your experience with {skills[question_number % len(skills)]} and describe a project where you used it?",
-            "category": skills[question_number % len(skills)],
-            "difficulty": "medium",
-            "expected_key_points": ["Technical depth", "Practical experience", "Problem-solving approach"],
-            "follow_up_context": "Fallback question - API Error"
-        }
-    question_data = parse_json_response(response)
+        _record_fallback(purpose, "api_error")
+        return fallback_interview_question(skills, question_number, "Fallback question - API Error")
+    question_data = _parse_llm_json(response, purpose)
 
     if not question_data or not isinstance(question_data, dict):
-        return {
-            "question": f"Can you explain your experience with {skills[question_number % len(skills)]} and describe a project where you used it?",
-            "category": skills[question_number % len(skills)],
-            "difficulty": "medium",
-            "expected_key_points": ["Technical depth", "Practical experience", "Problem-solving approach"],
-            "follow_up_context": "Fallback question"
-        }
+        _record_fallback(purpose, "invalid_response")
+        return fallback_interview_question(skills, question_number)
 
     return question_data
 
 
+async def stream_interview_question(
+    skills: list,
+    resume_text: str,
+    previous_qa: list,
+    question_number: int,
+    total_questions: int,
+    github_url: str = "",
+    coding_platforms: dict = None,
+    resume_digest: str = None,
+    context_summary: list = None
+):
+    """Streaming variant of generate_interview_question.
+
+    Yields ("delta", text) for each piece of the "question" field as it is
+    generated, then a final ("question", question_data). If the stream
+    fails before any text was sent, the usual fallback question is used.
+    """
+    messages = _interview_question_messages(
+        skills, resume_text, previous_qa, question_number, total_questions, github_url, coding_platforms,
+        resume_digest, context_summary
+    )
+    extractor = JsonStringFieldExtractor("question")
+    parts = []
+    sent_any = False
+    try:
+        async for chunk in stream_cerebras(messages, temperature=0.8, max_tokens=2000, purpose="interview_question"):
+            parts.append(chunk)
+            delta = extractor.feed(chunk)
+            if delta:
+                sent_any = True
+                yield "delta", delta
+    except Exception as e:
+        print(f"Cerebras streaming call failed: {e}")
+        if not sent_any:
+            _record_fallback("interview_question", "api_error")
+            fallback = fallback_interview_question(skills, question_number, "Fallback question - API Error")
+            yield "delta", fallback["question"]
+            yield "question", fallback
+            return
+
+    question_data = _parse_llm_json("".join(parts), "interview_question")
+    if not question_data or not isinstance(question_data, dict) or not question_data.get("question"):
+        # Keep whatever the candidate has already been shown
+        _record_fallback("interview_question", "invalid_response")
+        streamed = extractor.value()
+        question_data = fallback_interview_question(skills, question_number)
+        if streamed:
+            question_data["question"] = streamed
+        else:
+            yield "delta", question_data["question"]
+    yield "question", question_data
+
+
 async def evaluate_interview_answer(
     question: str,
     answer: str,
@@ -377,22 +1138,36 @@ Return ONLY valid JSON."""
         }
     ]
 
-    response = await call_cerebras(messages, temperature=0.3, max_tokens=2000)
-    evaluation = parse_json_response(response)
+    # API errors (LLM_ERRORS) propagate: a neutral score during an outage would pass everyone
+    response = await call_cerebras(
+        messages, temperature=0.3, max_tokens=2000, purpose="interview_evaluation", hedge_after=LLM_HEDGE_AFTER_SECONDS
+    )
+    evaluation = _parse_llm_json(response, "interview_evaluation")
 
     if not evaluation or not isinstance(evaluation, dict):
-        return {
-            "score": 5,
-            "feedback": "Answer received. Unable to perform detailed evaluation.",
-            "strengths": [],
-            "weaknesses": [],
-            "key_points_covered": [],
-            "suggestion": "Try to provide more detailed technical explanations."
-        }
+        _record_fallback("interview_evaluation", "invalid_response")
+        return fallback_evaluation()
 
     return evaluation
 
 
+def fallback_evaluation() -> dict:
+    """Unscored evaluation used when the model's response could not be parsed.
+
+    score is None and fallback is set, so the answer does not count towards
+    the interview result.
+    """
+    return {
+        "fallback": True,
+        "score": None,
+        "feedback": "Answer received. Unable to perform detailed evaluation.",
+        "strengths": [],
+        "weaknesses": [],
+        "key_points_covered": [],
+        "suggestion": "Try to provide more detailed technical explanations."
+    }
+
+
 async def generate_final_report(
     candidate_info: dict,
     mcq_results: dict,
@@ -448,20 +1223,31 @@ Generate a comprehensive report. Return ONLY valid JSON."""
         }
     ]
 
-    response = await call_cerebras(messages, temperature=0.5, max_tokens=4000)
-    report = parse_json_response(response)
+    # API errors (LLM_ERRORS) propagate so callers can retry instead of storing a placeholder
+    response = await call_cerebras(messages, temperature=0.5, max_tokens=4000, purpose="report")
+    report = _parse_llm_json(response, "report")
 
     if not report or not isinstance(report, dict):
-        return {
-            "overall_rating": "Average",
-            "summary": "Report generation encountered an issue. Please review individual test results.",
-            "strengths": [],
-            "areas_for_improvement": [],
-            "skill_assessment": {},
-            "recommendation": "Manual review recommended.",
-            "interview_highlights": [],
-            "concerns": [],
-            "suggested_role_fit": []
-        }
+        _record_fallback("report", "invalid_response")
+        return fallback_report()
 
     return report
+
+
+def fallback_report() -> dict:
+    """Placeholder report used when the model's response could not be parsed.
+
+    Marked with fallback so it is never stored over an existing report.
+    """
+    return {
+        "fallback": True,
+        "overall_rating": "Average",
+        "summary": "Report generation encountered an issue. Please review individual test results.",
+        "strengths": [],
+        "areas_for_improvement": [],
+        "skill_assessment": {},
+        "recommendation": "Manual review recommended.",
+        "interview_highlights": [],
+        "concerns": [],
+        "suggested_role_fit": []
+    }
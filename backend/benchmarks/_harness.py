@@ -0,0 +1,86 @@
+"""Shared setup for the backend benchmarks.
+
+Every benchmark runs against a throwaway SQLite file so the real
+skillproctor.db is never touched. Import this module before main.
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import statistics
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import database  # noqa: E402
+
+SAMPLE_SKILLS = sorted([
+    "python", "java", "javascript", "typescript", "go", "rust", "react", "node",
+    "django", "fastapi", "sql", "postgresql", "mongodb", "redis", "docker",
+    "kubernetes", "aws", "gcp", "terraform", "pandas", "numpy", "pytorch",
+    "git", "linux", "graphql", "kafka", "spark", "flask", "spring", "c++",
+])
+
+
+def use_temp_db(prefix: str = "bench") -> str:
+    """Point the database module at a fresh temporary file and create the schema."""
+    fd, path = tempfile.mkstemp(prefix=f"{prefix}_", suffix=".db")
+    os.close(fd)
+    database.DB_PATH = path
+    database.init_db()
+    return path
+
+
+def seed_candidates(count: int, resume_chars: int = 4000, seed: int = 42, batch: int = 5000):
+    """Insert `count` synthetic candidates with realistic resume_text sizes."""
+    rng = random.Random(seed)
+    filler = ("Experienced engineer building distributed systems and web services. " * 80)[:resume_chars]
+    statuses = ["pending", "test1_ready", "test1_in_progress", "test1_passed", "completed", "test1_failed"]
+    db = database.get_db()
+    rows = []
+    for i in range(count):
+        skills = sorted(rng.sample(SAMPLE_SKILLS, rng.randint(3, 10)))
+        created = f"2026-{1 + (i * 12) // count:02d}-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:00"
+        rows.append((
+            f"Candidate {i}", f"candidate{i}@example.com", "+1 555 0100",
+            "", f"Candidate {i}\n{' '.join(skills)}\n{filler}",
+            json.dumps(skills), "", "", json.dumps({}),
+            rng.choice(statuses), created,
+        ))
+        if len(rows) >= batch:
+            _insert_candidates(db, rows)
+            rows = []
+    if rows:
+        _insert_candidates(db, rows)
+    db.commit()
+    db.close()
+
+
+def _insert_candidates(db, rows):
+    db.executemany(
+        """INSERT INTO candidates (name, email, phone, resume_path, resume_text, skills,
+                                   github_url, linkedin_url, coding_platforms, status, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def summarize(samples_ms: list) -> dict:
+    return {
+        "n": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 2) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 2),
+        "p95_ms": round(percentile(samples_ms, 95), 2),
+        "p99_ms": round(percentile(samples_ms, 99), 2),
+    }
@@ -0,0 +1,98 @@
+"""Response size and latency of GET /api/admin/candidates.
+
+Compares the legacy full-table dump (SELECT * + json.loads per row, no
+LIMIT) against the keyset-paginated, projected listing.
+
+    python benchmarks/bench_candidates.py --sizes 10000 100000
+"""
+import os
+import json
+import time
+import argparse
+
+from _harness import use_temp_db, seed_candidates, summarize
+
+import database
+from fastapi.testclient import TestClient
+
+
+def legacy_candidates():
+    """The pre-pagination implementation, kept here as the baseline."""
+    db = database.get_db()
+    rows = db.execute("SELECT * FROM candidates ORDER BY created_at DESC").fetchall()
+    db.close()
+    return {"candidates": [{
+        "id": c["id"], "name": c["name"], "email": c["email"], "phone": c["phone"],
+        "skills": json.loads(c["skills"]), "github_url": c["github_url"],
+        "linkedin_url": c["linkedin_url"], "coding_platforms": json.loads(c["coding_platforms"]),
+        "status": c["status"], "created_at": c["created_at"],
+    } for c in rows]}
+
+
+def timed(fn, repeat):
+    samples, size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples), size
+
+
+def run(size: int, repeat: int):
+    path = use_temp_db("bench_candidates")
+    try:
+        seed_candidates(size)
+        from main import app
+        client = TestClient(app)
+
+        def legacy():
+            return len(json.dumps(legacy_candidates()).encode())
+
+        def first_page():
+            return len(client.get("/api/admin/candidates").content)
+
+        def projected_page():
+            return len(client.get("/api/admin/candidates", params={"fields": "id,name,status", "limit": 100}).content)
+
+        def filtered_page():
+            return len(client.get("/api/admin/candidates", params={"status": "pending", "skill": "python"}).content)
+
+        def skill_search_all():
+            return len(client.get("/api/admin/search/candidates", params={"skill": ["kubernetes", "go"]}).content)
+
+        def skill_search_any():
+            return len(client.get("/api/admin/search/candidates",
+                                  params={"skill": ["kubernetes", "go", "rust"], "match": "any"}).content)
+
+        # Walk 20 pages deep to show keyset cost stays flat with depth
+        cursor = None
+        for _ in range(20):
+            body = client.get("/api/admin/candidates", params={"cursor": cursor} if cursor else {}).json()
+            cursor = body["next_cursor"]
+
+        def deep_page():
+            return len(client.get("/api/admin/candidates", params={"cursor": cursor}).content)
+
+        print(f"\n== {size:,} candidates ==")
+        for label, fn, n in [
+            ("legacy full dump", legacy, max(1, repeat // 10)),
+            ("page 1 (limit=50)", first_page, repeat),
+            ("page 21 (keyset)", deep_page, repeat),
+            ("projected id,name,status", projected_page, repeat),
+            ("status+skill filter", filtered_page, repeat),
+            ("skill search all (2 skills)", skill_search_all, repeat),
+            ("skill search any (3 skills)", skill_search_any, repeat),
+        ]:
+            stats, nbytes = timed(fn, n)
+            print(f"{label:28s} {nbytes / 1024:10.1f} KiB  p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    for n in args.sizes:
+        run(n, args.repeat)
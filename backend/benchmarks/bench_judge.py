@@ -0,0 +1,216 @@
+"""Judge throughput for POST /api/student/run-code and /submit-code.
+
+Replays a seeded mix of realistic submissions (fast, slow, infinite-loop,
+high-output, crashing) in python/javascript/java against each endpoint at
+increasing concurrency, in-process on a temporary database, and reports
+submissions/second, latency percentiles and how long the event loop was
+stalled while the judge ran. Languages whose runtime is not on PATH are
+skipped.
+
+    python benchmarks/bench_judge.py --concurrency 1 4 16 --submissions 40
+    python benchmarks/bench_judge.py --mix fast=8,slow=2,crash=1 --languages python
+
+Infinite loops run into the judge's 10s per-run timeout (per test case for
+submit-code), so they dominate wall time; leave them out of --mix for a
+quick run.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+
+import httpx
+
+from _harness import use_temp_db, summarize
+
+import database
+
+PROGRAMS = {
+    "python": {
+        "fast": "a, b = map(int, input().split())\nprint(a + b)\n",
+        "slow": "a, b = map(int, input().split())\ns = 0\nfor i in range(3_000_000):\n    s += i\nprint(a + b)\n",
+        "infinite": "while True:\n    pass\n",
+        "high_output": "a, b = map(int, input().split())\nfor i in range(100_000):\n    print(i)\nprint(a + b)\n",
+        "crash": "a, b = map(int, input().split())\nraise RuntimeError('boom')\n",
+    },
+    "javascript": {
+        "fast": "const [a, b] = require('fs').readFileSync(0, 'utf8').trim().split(/\\s+/).map(Number);\nconsole.log(a + b);\n",
+        "slow": ("const [a, b] = require('fs').readFileSync(0, 'utf8').trim().split(/\\s+/).map(Number);\n"
+                 "let s = 0;\nfor (let i = 0; i < 300000000; i++) s += i;\nconsole.log(a + b);\n"),
+        "infinite": "while (true) {}\n",
+        "high_output": ("const [a, b] = require('fs').readFileSync(0, 'utf8').trim().split(/\\s+/).map(Number);\n"
+                        "const out = [];\nfor (let i = 0; i < 100000; i++) out.push(i);\n"
+                        "console.log(out.join('\\n'));\nconsole.log(a + b);\n"),
+        "crash": "throw new Error('boom');\n",
+    },
+    "java": {
+        "fast": ("import java.util.Scanner;\nclass Main { public static void main(String[] x) {\n"
+                 "Scanner in = new Scanner(System.in); System.out.println(in.nextInt() + in.nextInt()); } }\n"),
+        "slow": ("import java.util.Scanner;\nclass Main { public static void main(String[] x) {\n"
+                 "Scanner in = new Scanner(System.in); long s = 0;\n"
+                 "for (long i = 0; i < 2000000000L; i++) s += i ^ (s >>> 3);\n"
+                 "System.out.println(in.nextInt() + in.nextInt() + (s == 42 ? 1 : 0)); } }\n"),
+        "infinite": "class Main { public static void main(String[] x) { while (true) {} } }\n",
+        "high_output": ("import java.util.Scanner;\nclass Main { public static void main(String[] x) {\n"
+                        "Scanner in = new Scanner(System.in); StringBuilder sb = new StringBuilder();\n"
+                        "for (int i = 0; i < 100000; i++) sb.append(i).append('\\n');\n"
+                        "System.out.print(sb); System.out.println(in.nextInt() + in.nextInt()); } }\n"),
+        "crash": "class Main { public static void main(String[] x) { throw new RuntimeException(\"boom\"); } }\n",
+    },
+}
+RUNTIMES = {"python": ["python"], "javascript": ["node"], "java": ["javac", "java"]}
+DEFAULT_MIX = "fast=10,slow=4,high_output=2,crash=3,infinite=1"
+TEST_CASES = [{"input": f"{a} {b}", "expected_output": str(a + b)} for a, b in [(2, 3), (10, 32), (-4, 9)]]
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in PROGRAMS["python"]:
+            raise SystemExit(f"unknown workload {kind!r}; choose from {', '.join(PROGRAMS['python'])}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def available_languages(requested: list) -> list:
+    languages = []
+    for language in requested:
+        missing = [cmd for cmd in RUNTIMES[language] if not shutil.which(cmd)]
+        if missing:
+            print(f"skipping {language}: {', '.join(missing)} not on PATH")
+        else:
+            languages.append(language)
+    return languages
+
+
+def seed_coding_tests(count: int) -> list:
+    """One candidate and coding test per worker, each with the same sum problem."""
+    problem = {"id": 1, "title": "Sum", "description": "Print a + b.", "test_cases": TEST_CASES}
+    db = database.get_db()
+    ids = []
+    for i in range(count):
+        candidate_id = db.execute("INSERT INTO candidates (name, email, status) VALUES (?, ?, 'test1_in_progress')",
+                                  (f"Judge {i}", f"judge{i}@example.com")).lastrowid
+        test_id = db.execute("INSERT INTO coding_tests (candidate_id, problems, status) VALUES (?, ?, 'in_progress')",
+                             (candidate_id, json.dumps([problem]))).lastrowid
+        ids.append((test_id, candidate_id))
+    db.commit()
+    db.close()
+    return ids
+
+
+def workload(rng: random.Random, n: int, mix: dict, languages: list) -> list:
+    kinds, weights = list(mix), list(mix.values())
+    return [(rng.choice(languages), rng.choices(kinds, weights)[0]) for _ in range(n)]
+
+
+async def watch_loop(stop: asyncio.Event, interval: float, stalls: list):
+    """Record how late each tick fires; a late tick means the loop was blocked."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, loop.time() - expected))
+
+
+async def run_level(client, endpoint: str, jobs: list, concurrency: int, tests: list) -> dict:
+    latencies, errors, queue = [], 0, list(enumerate(jobs))
+    stalls, stop = [], asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(stop, 0.01, stalls))
+
+    async def worker(slot: int):
+        nonlocal errors
+        test_id, candidate_id = tests[slot]
+        while queue:
+            _, (language, kind) = queue.pop()
+            code = PROGRAMS[language][kind]
+            if endpoint == "run-code":
+                body = {"code": code, "language": language, "input_data": TEST_CASES[0]["input"]}
+            else:
+                body = {"candidate_id": candidate_id, "test_id": test_id, "problem_id": 1,
+                        "code": code, "language": language}
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"/api/student/{endpoint}", json=body)
+                if response.status_code != 200:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await watcher
+
+    return {
+        "endpoint": endpoint, "concurrency": concurrency, "submissions": len(jobs), "errors": errors,
+        "wall_s": round(wall, 2), "per_second": round(len(jobs) / wall, 2) if wall else 0.0,
+        **summarize(latencies),
+        "loop_stall_s": round(sum(stalls), 2),
+        "loop_stall_pct": round(100 * sum(stalls) / wall, 1) if wall else 0.0,
+        "max_stall_ms": round(max(stalls, default=0.0) * 1000, 1),
+    }
+
+
+async def run(args) -> list:
+    path = use_temp_db("bench_judge")
+    try:
+        languages = available_languages(args.languages)
+        if not languages:
+            raise SystemExit("no language runtimes available")
+        mix = parse_mix(args.mix)
+        tests = seed_coding_tests(max(args.concurrency))
+
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        results = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://judge", timeout=None) as client:
+            for endpoint in args.endpoints:
+                for concurrency in args.concurrency:
+                    rng = random.Random(f"{args.seed}:{endpoint}:{concurrency}")
+                    jobs = workload(rng, args.submissions, mix, languages)
+                    # submit-code has no java branch and would run java source as python
+                    if endpoint == "submit-code":
+                        jobs = [(lang if lang != "java" else "python", kind) for lang, kind in jobs]
+                    result = await run_level(client, endpoint, jobs, concurrency, tests)
+                    print_row(result)
+                    results.append(result)
+        return results
+    finally:
+        os.remove(path)
+
+
+def print_row(r: dict):
+    print(f"{r['endpoint']:<12} c={r['concurrency']:<3} {r['submissions']:>4} subs {r['errors']:>3} err  "
+          f"{r['per_second']:>7.2f}/s  p50 {r['p50_ms']:>9.1f}  p95 {r['p95_ms']:>9.1f}  p99 {r['p99_ms']:>9.1f} ms  "
+          f"loop stalled {r['loop_stall_s']:>6.2f}s ({r['loop_stall_pct']:>5.1f}%) max {r['max_stall_ms']:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--submissions", type=int, default=40, help="submissions per endpoint and concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="workload weights, e.g. fast=10,slow=4,crash=1")
+    parser.add_argument("--languages", nargs="+", choices=list(PROGRAMS), default=list(PROGRAMS))
+    parser.add_argument("--endpoints", nargs="+", choices=["run-code", "submit-code"], default=["run-code", "submit-code"])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if any(r["errors"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
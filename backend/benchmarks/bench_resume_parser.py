@@ -0,0 +1,172 @@
+"""Throughput, memory and golden-output checks for ResumeParser.
+
+Builds a deterministic corpus of synthetic resume PDFs (see synthetic_pdf.py)
+across page counts, layouts and skill densities, then times
+extract_text_from_pdf, extract_skills and parse_resume per resume and per
+page, and records the tracemalloc peak of parse_resume.
+
+Every run also compares parse_resume's output with the golden file so a
+parser optimisation cannot silently change what gets stored for a
+candidate. Regenerate it only when a behaviour change is intended:
+
+    python benchmarks/bench_resume_parser.py
+    python benchmarks/bench_resume_parser.py --pages 1 5 25 --repeat 5
+    python benchmarks/bench_resume_parser.py --update-golden
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+import PyPDF2
+
+from _harness import BACKEND_DIR
+from synthetic_pdf import LAYOUTS, make_resume_pdf
+
+from resume_parser import ResumeParser
+
+GOLDEN_PATH = os.path.join(BACKEND_DIR, "benchmarks", "golden", "resume_parser.json")
+DEFAULT_PAGES = (1, 2, 5, 10)
+DENSITIES = (0.05, 0.4)
+
+
+def corpus(pages_list) -> list:
+    """(case_id, pages, layout, density, seed) for every combination, in a stable order."""
+    cases = []
+    for pages in pages_list:
+        for layout in LAYOUTS:
+            for density in DENSITIES:
+                case_id = f"{layout}-p{pages}-d{int(density * 100)}"
+                seed = int(hashlib.sha256(case_id.encode()).hexdigest()[:8], 16)
+                cases.append((case_id, pages, layout, density, seed))
+    return cases
+
+
+def golden_record(parsed: dict) -> dict:
+    """parse_resume output with the full text replaced by its length and hash."""
+    record = {k: v for k, v in parsed.items() if k != "resume_text"}
+    text = parsed.get("resume_text", "")
+    record["text_chars"] = len(text)
+    record["text_sha256"] = hashlib.sha256(text.encode()).hexdigest()
+    return record
+
+
+def timed(fn, repeat: int):
+    """Median wall time in ms over `repeat` calls, and the last result."""
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def peak_memory_kb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run(args) -> tuple:
+    rows, outputs = [], {}
+    with tempfile.TemporaryDirectory(prefix="resume_bench_") as tmp:
+        for case_id, pages, layout, density, seed in corpus(args.pages):
+            path = os.path.join(tmp, f"{case_id}.pdf")
+            with open(path, "wb") as f:
+                f.write(make_resume_pdf(seed, pages, layout, density))
+
+            extract_ms, text = timed(lambda: ResumeParser.extract_text_from_pdf(path), args.repeat)
+            skills_ms, _ = timed(lambda: ResumeParser.extract_skills(text), args.repeat)
+            parse_ms, parsed = timed(lambda: ResumeParser.parse_resume(file_path=path), args.repeat)
+            peak_kb = peak_memory_kb(lambda: ResumeParser.parse_resume(file_path=path))
+
+            outputs[case_id] = golden_record(parsed)
+            rows.append({
+                "case": case_id, "pages": pages, "bytes": os.path.getsize(path),
+                "extract_ms": round(extract_ms, 2), "skills_ms": round(skills_ms, 2),
+                "parse_ms": round(parse_ms, 2), "parse_ms_per_page": round(parse_ms / pages, 2),
+                "peak_kb": round(peak_kb, 1), "skills": len(parsed.get("skills", [])),
+            })
+    return rows, outputs
+
+
+def print_rows(rows: list):
+    header = (f"{'case':<22} {'pages':>5} {'KB':>7} {'extract':>9} {'skills':>8} "
+              f"{'parse':>9} {'ms/page':>8} {'peak KB':>9} {'#skills':>7}")
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['case']:<22} {r['pages']:>5} {r['bytes'] / 1024:>7.1f} {r['extract_ms']:>9} {r['skills_ms']:>8} "
+              f"{r['parse_ms']:>9} {r['parse_ms_per_page']:>8} {r['peak_kb']:>9} {r['skills']:>7}")
+    total_ms = sum(r["parse_ms"] for r in rows)
+    total_pages = sum(r["pages"] for r in rows)
+    if total_ms:
+        print(f"\nparse_resume throughput: {len(rows) / total_ms * 1000:.1f} resumes/s, "
+              f"{total_pages / total_ms * 1000:.1f} pages/s")
+
+
+def check_golden(outputs: dict) -> list:
+    """Differences between this run and the golden file, for the cases both contain."""
+    with open(GOLDEN_PATH) as f:
+        golden = json.load(f)
+    if golden.get("pypdf2_version") != PyPDF2.__version__:
+        print(f"note: golden outputs were recorded with PyPDF2 {golden.get('pypdf2_version')}, "
+              f"running {PyPDF2.__version__}")
+    problems = []
+    for case_id, record in outputs.items():
+        expected = golden["cases"].get(case_id)
+        if expected is None:
+            problems.append(f"{case_id}: not in golden file (run with --update-golden to add it)")
+            continue
+        for key in sorted(set(expected) | set(record)):
+            if expected.get(key) != record.get(key):
+                problems.append(f"{case_id}: {key} changed: {expected.get(key)!r} -> {record.get(key)!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=list(DEFAULT_PAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--update-golden", action="store_true", help="rewrite the golden outputs from this run")
+    parser.add_argument("--json", help="write timings to this file")
+    args = parser.parse_args()
+
+    rows, outputs = run(args)
+    print_rows(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.update_golden:
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        existing = {}
+        if os.path.exists(GOLDEN_PATH):
+            with open(GOLDEN_PATH) as f:
+                existing = json.load(f).get("cases", {})
+        existing.update(outputs)
+        with open(GOLDEN_PATH, "w") as f:
+            json.dump({"pypdf2_version": PyPDF2.__version__, "cases": dict(sorted(existing.items()))}, f, indent=1)
+            f.write("\n")
+        print(f"\nWrote {len(outputs)} golden cases to {os.path.relpath(GOLDEN_PATH, BACKEND_DIR)}")
+        return
+
+    problems = check_golden(outputs)
+    if problems:
+        print(f"\n{len(problems)} golden output mismatches:")
+        for line in problems:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nGolden outputs match for all {len(outputs)} cases")
+
+
+if __name__ == "__main__":
+    main()
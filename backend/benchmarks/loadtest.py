@@ -0,0 +1,315 @@
+"""End-to-end load test: N simulated candidates sit a full exam drive.
+
+Each candidate logs in, takes the MCQ test, runs and submits code, runs SQL
+and completes the AI interview, posting proctoring events in the background
+the whole time. Tests are generated up front through the admin endpoint.
+All LLM traffic goes to benchmarks/mock_llm.py, so no Cerebras quota is used.
+
+By default the app and the mock LLM both run in-process on a temporary
+database:
+
+    python benchmarks/loadtest.py --candidates 50 --ramp-seconds 10
+
+To drive a running server instead, start the mock and the API yourself
+(see mock_llm.py) and point the harness at the database the server uses,
+so it can seed candidates:
+
+    python benchmarks/loadtest.py --base-url http://127.0.0.1:8000 --db /tmp/drive.db
+
+Reports throughput plus mean/p50/p95/p99 and error rate per endpoint.
+With --baseline, exits non-zero if any endpoint's p95 regressed by more
+than --tolerance against a previous --json report.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import defaultdict
+
+import httpx
+
+from _harness import use_temp_db, seed_candidates, summarize
+
+import database
+
+PYTHON_SUM = "a, b = map(int, input().split())\nprint(a + b)\n"
+SQL_QUERY = "SELECT department, COUNT(*) AS n FROM employees GROUP BY department ORDER BY n DESC"
+ANSWER_WORDS = ("I used this in production to build a service that handled retries, caching, "
+                "observability and careful schema design while keeping latency low").split()
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_examples = {}
+
+    async def call(self, client: httpx.AsyncClient, method: str, label: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception as e:
+            self.samples[label].append((time.perf_counter() - started) * 1000)
+            self.errors[label] += 1
+            self.error_examples.setdefault(label, repr(e))
+            return None
+        self.samples[label].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+            self.error_examples.setdefault(label, f"{response.status_code} {response.text[:200]}")
+            return None
+        return response.json()
+
+    def report(self, wall_seconds: float) -> dict:
+        endpoints = {}
+        for label in sorted(self.samples):
+            stats = summarize(self.samples[label])
+            stats["errors"] = self.errors[label]
+            stats["error_rate"] = round(self.errors[label] / stats["n"], 4)
+            endpoints[label] = stats
+        total = sum(len(v) for v in self.samples.values())
+        return {
+            "wall_seconds": round(wall_seconds, 2),
+            "requests": total,
+            "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0.0,
+            "errors": sum(self.errors.values()),
+            "endpoints": endpoints,
+            "error_examples": self.error_examples,
+        }
+
+
+async def think(args):
+    if args.think_ms:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * args.think_ms / 1000)
+
+
+async def proctor(client, rec, args, candidate_id: int, state: dict):
+    """Post a proctoring event every --proctor-interval seconds while the candidate is in a test."""
+    events = ["tab_switch", "face_not_detected", "window_blur", "copy_paste"]
+    while True:
+        await asyncio.sleep(args.proctor_interval * random.uniform(0.8, 1.2))
+        if state.get("test_type"):
+            await rec.call(client, "POST", "POST /api/proctoring/log", "/api/proctoring/log", json={
+                "candidate_id": candidate_id, "test_type": state["test_type"], "test_id": state["test_id"],
+                "event_type": random.choice(events), "details": "loadtest", "severity": "low",
+            })
+
+
+async def candidate_session(client, rec, args, candidate_id: int):
+    state = {}
+    proctoring = asyncio.create_task(proctor(client, rec, args, candidate_id, state))
+    try:
+        login = await rec.call(client, "POST", "POST /api/candidate/login", "/api/candidate/login",
+                               json={"email": f"candidate{candidate_id - 1}@example.com", "candidate_id": candidate_id})
+        if not login:
+            return
+        info = await rec.call(client, "GET", "GET /api/student/test-info/{candidate_id}", f"/api/student/test-info/{candidate_id}")
+        if not info or not info["mcq_test"]:
+            return
+
+        # MCQ
+        mcq_id = info["mcq_test"]["id"]
+        state.update(test_type="mcq", test_id=mcq_id)
+        mcq = await rec.call(client, "POST", "POST /api/student/start-mcq/{test_id}", f"/api/student/start-mcq/{mcq_id}")
+        if not mcq:
+            return
+        await think(args)
+        answers = {str(q["id"]): random.randrange(4) for q in mcq["questions"]}
+        await rec.call(client, "POST", "POST /api/student/submit-mcq", "/api/student/submit-mcq",
+                       json={"candidate_id": candidate_id, "test_id": mcq_id, "answers": answers})
+
+        # Coding
+        coding_id = info["coding_test"]["id"]
+        state.update(test_type="coding", test_id=coding_id)
+        coding = await rec.call(client, "POST", "POST /api/student/start-coding/{test_id}", f"/api/student/start-coding/{coding_id}")
+        if not coding:
+            return
+        for problem in coding["problems"]:
+            await think(args)
+            await rec.call(client, "POST", "POST /api/student/run-code", "/api/student/run-code",
+                           json={"code": PYTHON_SUM, "language": "python", "input_data": problem.get("sample_input", "1 2")})
+            await rec.call(client, "POST", "POST /api/student/submit-code", "/api/student/submit-code", json={
+                "candidate_id": candidate_id, "test_id": coding_id, "problem_id": problem["id"],
+                "code": PYTHON_SUM, "language": "python",
+            })
+        await rec.call(client, "POST", "POST /api/student/finish-coding/{test_id}", f"/api/student/finish-coding/{coding_id}")
+
+        # SQL
+        state.update(test_type="sql", test_id=candidate_id)
+        await think(args)
+        await rec.call(client, "POST", "POST /api/student/run-sql", "/api/student/run-sql", json={"query": SQL_QUERY})
+        await rec.call(client, "POST", "POST /api/student/finish-sql/{candidate_id}", f"/api/student/finish-sql/{candidate_id}")
+
+        # Interview
+        info = await rec.call(client, "GET", "GET /api/student/test-info/{candidate_id}", f"/api/student/test-info/{candidate_id}")
+        if not info or not info["interview"]:
+            return
+        interview_id = info["interview"]["id"]
+        state.update(test_type="interview", test_id=interview_id)
+        if args.interview_questions:
+            db = database.get_db()
+            db.execute("UPDATE ai_interviews SET total_questions = ? WHERE id = ?", (args.interview_questions, interview_id))
+            db.commit()
+            db.close()
+        started = await rec.call(client, "POST", "POST /api/student/start-interview/{interview_id}",
+                                 f"/api/student/start-interview/{interview_id}")
+        if not started:
+            return
+        for _ in range(args.interview_questions or started["total_questions"]):
+            await think(args)
+            words = random.randint(30, 120)
+            answer = " ".join(random.choice(ANSWER_WORDS) for _ in range(words))
+            result = await rec.call(client, "POST", "POST /api/student/answer-interview", "/api/student/answer-interview",
+                                    json={"candidate_id": candidate_id, "interview_id": interview_id, "answer": answer})
+            if not result or result.get("is_complete"):
+                break
+    finally:
+        proctoring.cancel()
+
+
+async def generate_tests(client, rec, candidate_ids: list, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(candidate_id):
+        async with semaphore:
+            await rec.call(client, "POST", "POST /api/admin/generate-test/{candidate_id}",
+                           f"/api/admin/generate-test/{candidate_id}")
+    await asyncio.gather(*(one(cid) for cid in candidate_ids))
+
+
+def use_in_process_llm(args):
+    """Route ai_service's HTTP calls to the mock LLM app and apply the scheduler settings."""
+    import ai_service
+    import mock_llm
+
+    mock_llm.config.latency = args.llm_latency
+    mock_llm.config.latency_ms = args.llm_latency_ms
+    mock_llm.config.error_rate = args.llm_error_rate
+    mock_llm.config.seed = args.seed
+    ai_service.CEREBRAS_API_KEY = ai_service.CEREBRAS_API_KEY or "mock"
+    ai_service.CEREBRAS_API_URL = "http://mock-llm/v1/chat/completions"
+    ai_service._http_client = lambda: httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=mock_llm.app), timeout=ai_service.LLM_TIMEOUT_SECONDS
+    )
+    ai_service._scheduler = ai_service.LLMScheduler(args.llm_concurrency, args.llm_rpm, args.llm_tpm)
+
+
+async def run(args) -> dict:
+    random.seed(args.seed)
+    if args.base_url:
+        database.DB_PATH = args.db
+        database.init_db()
+    else:
+        use_temp_db("loadtest")
+    seed_candidates(args.candidates, seed=args.seed)
+    db = database.get_db()
+    db.execute("UPDATE candidates SET status = 'pending'")
+    db.commit()
+    candidate_ids = [r["id"] for r in db.execute("SELECT id FROM candidates ORDER BY id").fetchall()]
+    db.close()
+
+    rec = Recorder()
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        app = None
+    else:
+        use_in_process_llm(args)
+        import main
+        app = main
+        await main.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://app", timeout=args.timeout)
+
+    try:
+        setup_started = time.perf_counter()
+        await generate_tests(client, rec, candidate_ids, args.setup_concurrency)
+        print(f"Generated tests for {len(candidate_ids)} candidates in {time.perf_counter() - setup_started:.1f}s")
+
+        async def ramped(i, candidate_id):
+            if args.ramp_seconds:
+                await asyncio.sleep(args.ramp_seconds * i / max(len(candidate_ids), 1))
+            await candidate_session(client, rec, args, candidate_id)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(ramped(i, cid) for i, cid in enumerate(candidate_ids)))
+        return rec.report(time.perf_counter() - started)
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.shutdown()
+
+
+def print_report(report: dict):
+    print(f"\n{report['requests']} requests in {report['wall_seconds']}s "
+          f"({report['throughput_rps']} req/s), {report['errors']} errors")
+    header = f"{'endpoint':<52} {'n':>6} {'err%':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for label, s in report["endpoints"].items():
+        print(f"{label:<52} {s['n']:>6} {s['error_rate'] * 100:>5.1f}% {s['mean_ms']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+    for label, example in report["error_examples"].items():
+        print(f"  first error on {label}: {example}")
+
+
+def regressions(report: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    """Endpoints whose p95 grew by more than tolerance (and by at least min_delta_ms, to ignore noise)."""
+    found = []
+    for label, stats in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if not before:
+            continue
+        grew = stats["p95_ms"] - before["p95_ms"]
+        if grew >= min_delta_ms and stats["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            found.append(f"{label}: p95 {before['p95_ms']}ms -> {stats['p95_ms']}ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--ramp-seconds", type=float, default=5.0)
+    parser.add_argument("--think-ms", type=float, default=200.0, help="mean pause between a candidate's actions")
+    parser.add_argument("--proctor-interval", type=float, default=2.0, help="seconds between proctoring events")
+    parser.add_argument("--interview-questions", type=int, default=3, help="0 keeps each interview's own total")
+    parser.add_argument("--setup-concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--db", help="SQLite file used by the server at --base-url (seeded by the harness)")
+    parser.add_argument("--llm-latency", default="lognormal", choices=["fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-concurrency", type=int, default=16)
+    parser.add_argument("--llm-rpm", type=int, default=0, help="scheduler requests/min for the mock (0 = unlimited)")
+    parser.add_argument("--llm-tpm", type=int, default=0, help="scheduler tokens/min for the mock (0 = unlimited)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="previous --json report to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth vs baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+    if args.base_url and not args.db:
+        parser.error("--base-url needs --db so candidates can be seeded")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance, args.min_delta_ms)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+    if not args.base_url:
+        os.remove(database.DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Local OpenAI-compatible stand-in for Cerebras, for load tests and offline runs.
+
+Recognises the prompts built by ai_service (MCQ, coding, interview question,
+answer evaluation, report) and answers with schema-valid JSON. Content is
+deterministic per prompt and --seed; latency and injected errors are drawn
+from a seeded RNG so runs are repeatable.
+
+    python benchmarks/mock_llm.py --port 8100 --latency lognormal --latency-ms 400
+    CEREBRAS_BASE_URL=http://127.0.0.1:8100/v1 CEREBRAS_API_KEY=mock uvicorn main:app
+
+Settings can be changed while running with POST /_mock/config (same keys as
+MockConfig) and request counts are available from GET /_mock/stats.
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from dataclasses import dataclass, asdict, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class MockConfig:
+    latency: str = "fixed"          # fixed | uniform | normal | lognormal
+    latency_ms: float = 200.0       # mean (or fixed) time to first token
+    latency_spread: float = 0.5     # uniform: +/- fraction; normal: stddev fraction; lognormal: sigma
+    tokens_per_second: float = 2000.0  # streaming / generation speed; 0 sends everything at once
+    error_rate: float = 0.0         # fraction of requests answered with an error status
+    error_codes: list = field(default_factory=lambda: [429, 503])
+    retry_after: float = 1.0        # Retry-After sent with 429s
+    malformed_rate: float = 0.0     # fraction of 200s whose content is not valid JSON
+    seed: int = 0
+
+
+config = MockConfig()
+_rng = random.Random(config.seed)
+stats = {"requests": 0, "streams": 0, "errors": 0, "malformed": 0, "by_kind": {}}
+
+app = FastAPI(title="Mock LLM")
+
+
+# ──────────────── Canned responses ────────────────
+
+def _prompt_kind(messages: list) -> str:
+    system = messages[0]["content"] if messages else ""
+    if "multiple choice questions" in system:
+        return "mcq"
+    if "coding challenge designer" in system:
+        return "coding"
+    if "conducting an AI-powered interview" in system:
+        return "interview_question"
+    if "interview evaluator" in system:
+        return "evaluation"
+    if "hiring assessment analyst" in system:
+        return "report"
+    return "other"
+
+
+def _skills(text: str, pattern: str) -> list:
+    match = re.search(pattern, text)
+    skills = [s.strip() for s in match.group(1).split(",")] if match else []
+    return [s for s in skills if s] or ["python"]
+
+
+def _count(text: str, pattern: str, default: int) -> int:
+    match = re.search(pattern, text)
+    return int(match.group(1)) if match else default
+
+
+def _mcq(user: str, rng: random.Random) -> list:
+    skills = _skills(user, r"based on these skills: ([^\n]+)")
+    count = _count(user, r"Generate (\d+) technical MCQ", 20)
+    questions = []
+    for i in range(count):
+        skill = skills[i % len(skills)]
+        questions.append({
+            "id": i + 1,
+            "question": f"Mock question {i + 1}: which statement about {skill} is correct?",
+            "skill": skill,
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "options": [f"{skill} statement {c}" for c in "ABCD"],
+            "correct_answer": rng.randrange(4),
+            "explanation": f"Mock explanation for {skill}.",
+        })
+    return questions
+
+
+def _coding(user: str, rng: random.Random) -> list:
+    skills = _skills(user, r"test these skills: ([^\n]+)")
+    count = _count(user, r"Generate (\d+) coding problems", 3)
+    problems = []
+    for i in range(count):
+        a, b = rng.randrange(100), rng.randrange(100)
+        problems.append({
+            "id": i + 1,
+            "title": f"Mock Sum {i + 1}",
+            "description": "Read two integers and print their sum.\n\nExample:\nInput: 2 3\nOutput: 5",
+            "difficulty": ["easy", "medium", "hard"][i % 3],
+            "skills_tested": skills[:2],
+            "input_format": "Two space-separated integers",
+            "output_format": "Their sum",
+            "sample_input": f"{a} {b}",
+            "sample_output": str(a + b),
+            "test_cases": [{"input": f"{a + k} {b}", "expected_output": str(a + b + k)} for k in range(3)],
+            "time_limit_seconds": 5,
+            "hints": ["Parse the input", "Add the numbers"],
+        })
+    return problems
+
+
+def _interview_question(user: str, rng: random.Random) -> dict:
+    skills = _skills(user, r"Candidate Skills: ([^\n]+)")
+    number = _count(user, r"Question (\d+) of", 1)
+    skill = skills[(number - 1) % len(skills)]
+    return {
+        "question": f"Mock interview question {number}: how have you used {skill} in a real project, and what trade-offs did you make?",
+        "category": skill,
+        "difficulty": ["easy", "medium", "hard"][min(number - 1, 2) if number < 4 else rng.randrange(3)],
+        "expected_key_points": [f"{skill} fundamentals", "trade-offs", "concrete example"],
+        "follow_up_context": "Mock follow-up context.",
+    }
+
+
+def _evaluation(user: str, rng: random.Random) -> dict:
+    answer = user.split("Candidate's Answer:", 1)[-1]
+    score = min(10, max(0, len(answer.split()) // 10 + rng.randrange(4)))
+    return {
+        "score": score,
+        "feedback": "Mock feedback.",
+        "strengths": ["clear structure"],
+        "weaknesses": ["could go deeper"],
+        "key_points_covered": ["trade-offs"] if score >= 5 else [],
+        "suggestion": "Mock suggestion.",
+    }
+
+
+def _report(user: str, rng: random.Random) -> dict:
+    skills = _skills(user, r'Skills: \[([^\]]*)\]')
+    return {
+        "overall_rating": rng.choice(["Excellent", "Good", "Average", "Below Average"]),
+        "summary": "Mock report summary.",
+        "strengths": ["problem solving"],
+        "areas_for_improvement": ["system design"],
+        "skill_assessment": {s.strip('" '): rng.randrange(4, 10) for s in skills},
+        "recommendation": "Mock recommendation.",
+        "interview_highlights": ["mock highlight"],
+        "concerns": [],
+        "suggested_role_fit": ["Software Engineer"],
+    }
+
+
+_BUILDERS = {
+    "mcq": _mcq,
+    "coding": _coding,
+    "interview_question": _interview_question,
+    "evaluation": _evaluation,
+    "report": _report,
+}
+
+
+def build_content(messages: list) -> tuple:
+    """(kind, content string) for a chat request; same prompt and seed give the same content."""
+    kind = _prompt_kind(messages)
+    user = messages[-1]["content"] if messages else ""
+    digest = hashlib.sha256(f"{config.seed}\n{json.dumps(messages)}".encode()).digest()
+    rng = random.Random(int.from_bytes(digest[:8], "big"))
+    builder = _BUILDERS.get(kind)
+    payload = builder(user, rng) if builder else {"text": "mock response"}
+    return kind, json.dumps(payload)
+
+
+# ──────────────── Latency / errors ────────────────
+
+def first_token_delay() -> float:
+    mean = config.latency_ms / 1000.0
+    spread = config.latency_spread
+    if config.latency == "uniform":
+        return max(0.0, _rng.uniform(mean * (1 - spread), mean * (1 + spread)))
+    if config.latency == "normal":
+        return max(0.0, _rng.gauss(mean, mean * spread))
+    if config.latency == "lognormal":
+        # parameterised so the median equals latency_ms; sigma sets the tail
+        return _rng.lognormvariate(0.0, spread) * mean
+    return mean
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _usage(messages: list, content: str) -> dict:
+    prompt = sum(_estimate_tokens(m.get("content") or "") for m in messages)
+    completion = _estimate_tokens(content)
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+def _injected_error():
+    if config.error_rate and _rng.random() < config.error_rate:
+        status = _rng.choice(config.error_codes)
+        stats["errors"] += 1
+        headers = {"Retry-After": str(config.retry_after)} if status == 429 else {}
+        return JSONResponse({"error": {"message": "mock injected error", "code": status}}, status_code=status, headers=headers)
+    return None
+
+
+def _maybe_malform(content: str) -> str:
+    if config.malformed_rate and _rng.random() < config.malformed_rate:
+        stats["malformed"] += 1
+        return "Sure! Here is what you asked for: " + content[: len(content) // 2]
+    return content
+
+
+# ──────────────── Routes ────────────────
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages") or []
+    stats["requests"] += 1
+
+    await asyncio.sleep(first_token_delay())
+    error = _injected_error()
+    if error is not None:
+        return error
+
+    kind, content = build_content(messages)
+    stats["by_kind"][kind] = stats["by_kind"].get(kind, 0) + 1
+    content = _maybe_malform(content)
+    usage = _usage(messages, content)
+    model = body.get("model", "mock")
+    created = int(time.time())
+
+    if body.get("stream"):
+        stats["streams"] += 1
+        return StreamingResponse(_stream(content, usage, model, created), media_type="text/event-stream")
+
+    if config.tokens_per_second:
+        await asyncio.sleep(usage["completion_tokens"] / config.tokens_per_second)
+    return {
+        "id": f"mock-{stats['requests']}",
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": usage,
+    }
+
+
+async def _stream(content: str, usage: dict, model: str, created: int):
+    chunk_chars = 16
+    delay = (chunk_chars / 4) / config.tokens_per_second if config.tokens_per_second else 0
+    for start in range(0, len(content), chunk_chars):
+        event = {
+            "object": "chat.completion.chunk", "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {"content": content[start:start + chunk_chars]}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(event)}\n\n"
+        if delay:
+            await asyncio.sleep(delay)
+    yield f"data: {json.dumps({'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.get("/_mock/config")
+async def get_config():
+    return asdict(config)
+
+
+@app.post("/_mock/config")
+async def update_config(request: Request):
+    global _rng
+    updates = await request.json()
+    for key, value in updates.items():
+        if hasattr(config, key):
+            setattr(config, key, value)
+    if "seed" in updates:
+        _rng = random.Random(config.seed)
+    return asdict(config)
+
+
+@app.get("/_mock/stats")
+async def get_stats():
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "normal", "lognormal"], default=config.latency)
+    parser.add_argument("--latency-ms", type=float, default=config.latency_ms)
+    parser.add_argument("--latency-spread", type=float, default=config.latency_spread)
+    parser.add_argument("--tokens-per-second", type=float, default=config.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=config.error_rate)
+    parser.add_argument("--error-codes", type=int, nargs="+", default=config.error_codes)
+    parser.add_argument("--retry-after", type=float, default=config.retry_after)
+    parser.add_argument("--malformed-rate", type=float, default=config.malformed_rate)
+    parser.add_argument("--seed", type=int, default=config.seed)
+    args = parser.parse_args()
+
+    global _rng
+    for key in asdict(config):
+        setattr(config, key, getattr(args, key))
+    _rng = random.Random(config.seed)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
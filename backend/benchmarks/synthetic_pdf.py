@@ -0,0 +1,134 @@
+"""Deterministic synthetic resume PDFs for the parser benchmarks.
+
+Pure Python (no PDF library): writes a minimal PDF 1.4 file with one
+Helvetica font and text-only content streams. Layout, page count and how
+often skills appear are all parameters so parser cost can be measured
+along each axis.
+"""
+import random
+
+from _harness import SAMPLE_SKILLS
+
+LAYOUTS = ("single", "two_column", "dense")
+
+FIRST_NAMES = ["Asha", "Ravi", "Maya", "Leo", "Nina", "Omar", "Priya", "Sam", "Tara", "Victor"]
+LAST_NAMES = ["Kumar", "Lopez", "Chen", "Okafor", "Novak", "Iyer", "Smith", "Haddad", "Sato", "Berg"]
+FILLER = (
+    "Worked closely with product and design to ship features on a weekly cadence",
+    "Reduced infrastructure cost by consolidating services and tuning autoscaling",
+    "Mentored junior engineers and ran the team's code review rotation",
+    "Owned on-call for the payments platform and wrote the incident runbooks",
+    "Improved page load time by profiling and removing redundant network calls",
+    "Migrated a legacy monolith module to a separately deployable service",
+    "Presented quarterly architecture reviews to engineering leadership",
+    "Built internal tooling that automated release notes and changelogs",
+)
+SECTIONS = ("Experience", "Projects", "Education", "Achievements", "Certifications")
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+LAYOUT_STYLE = {
+    # font size, leading, characters per line, columns
+    "single": (10, 14, 95, 1),
+    "two_column": (9, 12, 48, 2),
+    "dense": (7, 9, 130, 1),
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int) -> list:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def resume_lines(rng: random.Random, pages: int, layout: str, skill_density: float) -> list:
+    """Plain-text lines for a resume long enough to fill `pages` pages in `layout`."""
+    size, leading, width, columns = LAYOUT_STYLE[layout]
+    lines_per_page = ((PAGE_HEIGHT - 96) // leading) * columns
+    target = lines_per_page * pages
+
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first.lower()}{last.lower()}{rng.randrange(100)}"
+    skills = rng.sample(SAMPLE_SKILLS, rng.randint(4, 12))
+    lines = [
+        f"{first} {last}",
+        f"{handle}@example.com | +1 555 {rng.randrange(100, 999)} {rng.randrange(1000, 9999)}",
+        f"github.com/{handle} | linkedin.com/in/{handle} | leetcode.com/{handle}",
+        "Skills: " + ", ".join(skills),
+    ]
+    section = 0
+    while len(lines) < target:
+        if len(lines) % 20 == 4:
+            lines.append(SECTIONS[section % len(SECTIONS)])
+            section += 1
+            continue
+        sentence = rng.choice(FILLER)
+        if rng.random() < skill_density:
+            sentence += f" using {rng.choice(skills)} and {rng.choice(SAMPLE_SKILLS)}"
+        lines.extend(_wrap(sentence + ".", width))
+    return lines[:target]
+
+
+def _page_stream(lines: list, layout: str) -> bytes:
+    size, leading, width, columns = LAYOUT_STYLE[layout]
+    per_column = (PAGE_HEIGHT - 96) // leading
+    column_width = (PAGE_WIDTH - 96) // columns
+    ops = []
+    for column in range(columns):
+        chunk = lines[column * per_column:(column + 1) * per_column]
+        if not chunk:
+            break
+        x = 48 + column * column_width
+        ops.append(f"BT /F1 {size} Tf {leading} TL {x} {PAGE_HEIGHT - 48} Td")
+        for line in chunk:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+    return "\n".join(ops).encode("latin-1", "replace")
+
+
+def make_resume_pdf(seed: int, pages: int = 1, layout: str = "single", skill_density: float = 0.2) -> bytes:
+    """Build a resume PDF; the same arguments always produce the same bytes."""
+    rng = random.Random(seed)
+    lines = resume_lines(rng, pages, layout, skill_density)
+    size, leading, width, columns = LAYOUT_STYLE[layout]
+    per_page = ((PAGE_HEIGHT - 96) // leading) * columns
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    kids = []
+    for p in range(pages):
+        page_obj, content_obj = 4 + 2 * p, 5 + 2 * p
+        kids.append(f"{page_obj} 0 R")
+        stream = _page_stream(lines[p * per_page:(p + 1) * per_page], layout)
+        objects[page_obj] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>"
+        ).encode()
+        objects[content_obj] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n" % number + objects[number] + b"\nendobj\n"
+    xref_at = len(out)
+    count = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % count
+    for number in range(1, count):
+        out += b"%010d 00000 n \n" % offsets[number]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref_at)
+    return bytes(out)
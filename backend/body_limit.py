@@ -0,0 +1,48 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware capping request body size for selected paths.
+
+    Requests declaring a larger Content-Length get a 413 before any of the
+    body is read. Bodies without a usable Content-Length (chunked uploads)
+    are counted as they are received and the request fails with 413 as soon
+    as the limit is passed, so the multipart parser never spools more than
+    the limit to disk.
+
+    limits maps an exact request path to its maximum body size in bytes.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = "Request body is too large"
+        headers = dict(scope["headers"])
+        try:
+            declared = int(headers.get(b"content-length", b""))
+        except ValueError:
+            declared = None
+        if declared is not None and declared > max_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,13 +1,61 @@
 import sqlite3
 import os
 import json
+import time
 from datetime import datetime
 
+import metrics
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "skillproctor.db")
 
+# Columns added after the original schema: (table, column, definition).
+# init_db adds any that are missing so existing databases keep working.
+ADDED_COLUMNS = [
+    ("candidates", "sql_passed", "BOOLEAN DEFAULT 0"),
+    ("ai_interviews", "prefetched_question", "TEXT"),
+    ("ai_interviews", "resume_digest", "TEXT"),
+    ("ai_interviews", "context_summary", "TEXT DEFAULT '[]'"),
+    ("candidates", "resume_sha256", "TEXT"),
+    ("jobs", "locked_by", "TEXT"),
+    ("jobs", "heartbeat_at", "TIMESTAMP"),
+]
+
+
+db_query_seconds = metrics.histogram(
+    "db_query_seconds", "Time spent in SQLite execute calls by statement type",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection that times statements run through conn.execute/executemany.
+
+    For SELECTs this covers preparing the statement and producing the first
+    row; rows fetched afterwards are not included.
+    """
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+    def execute(self, sql, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, *args)
+        finally:
+            db_query_seconds.observe(time.perf_counter() - started, operation=_statement_type(sql))
+
+    def executemany(self, sql, *args):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, *args)
+        finally:
+            db_query_seconds.observe(time.perf_counter() - started, operation=_statement_type(sql))
+
+
+def _statement_type(sql: str) -> str:
+    words = sql.split(None, 1)
+    return words[0].upper() if words else "EMPTY"
+
+
+def get_db(check_same_thread: bool = True):
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread, factory=TimedConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
@@ -16,6 +64,7 @@ def get_db():
 def init_db():
     conn = get_db()
     cursor = conn.cursor()
+    existing_tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
 
     cursor.executescript("""
         CREATE TABLE IF NOT EXISTS candidates (
@@ -31,10 +80,29 @@ def init_db():
             coding_platforms TEXT DEFAULT '{}',
             sql_passed BOOLEAN DEFAULT 0,
             status TEXT DEFAULT 'pending',
+            resume_sha256 TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
+        -- Content-addressed resume files (see resume_store.py); refcount is
+        -- kept in step with candidates.resume_sha256 by the triggers below
+        CREATE TABLE IF NOT EXISTS resume_blobs (
+            sha256 TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Inverted index of candidates.skills (lower-cased), kept in sync by triggers
+        CREATE TABLE IF NOT EXISTS candidate_skills (
+            skill TEXT NOT NULL,
+            candidate_id INTEGER NOT NULL,
+            PRIMARY KEY (skill, candidate_id),
+            FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_candidate_skills_candidate ON candidate_skills(candidate_id);
+
         CREATE TABLE IF NOT EXISTS mcq_tests (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             candidate_id INTEGER NOT NULL,
@@ -80,10 +148,44 @@ def init_db():
             end_time TIMESTAMP,
             violations TEXT DEFAULT '[]',
             violation_count INTEGER DEFAULT 0,
+            prefetched_question TEXT,
+            resume_digest TEXT,
+            context_summary TEXT DEFAULT '[]',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE
         );
 
+        CREATE TABLE IF NOT EXISTS interview_turns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            interview_id INTEGER NOT NULL,
+            turn_index INTEGER NOT NULL,
+            question TEXT NOT NULL,
+            question_data TEXT DEFAULT '{}',
+            answer TEXT,
+            score REAL,
+            evaluation TEXT,
+            asked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            answered_at TIMESTAMP,
+            UNIQUE (interview_id, turn_index),
+            FOREIGN KEY (interview_id) REFERENCES ai_interviews(id) ON DELETE CASCADE
+        );
+
+        -- Rebuilds the legacy ai_interviews.questions_answers JSON from interview_turns
+        CREATE VIEW IF NOT EXISTS interview_qa_legacy AS
+        SELECT interview_id, json_group_array(json(turn)) AS questions_answers
+        FROM (
+            SELECT interview_id, turn_index, json_object(
+                'question_data', json(question_data),
+                'question', question,
+                'answer', answer,
+                'score', score,
+                'evaluation', json(evaluation)
+            ) AS turn
+            FROM interview_turns
+            ORDER BY interview_id, turn_index
+        )
+        GROUP BY interview_id;
+
         CREATE TABLE IF NOT EXISTS proctoring_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             candidate_id INTEGER NOT NULL,
@@ -121,6 +223,147 @@ def init_db():
             role TEXT DEFAULT 'admin',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
+
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_type TEXT NOT NULL,
+            payload TEXT DEFAULT '{}',
+            status TEXT DEFAULT 'queued',
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 3,
+            result TEXT,
+            error TEXT,
+            run_after TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            locked_by TEXT,
+            heartbeat_at TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs(status, run_after, id);
+
+        -- Keyset pagination for the admin candidate list
+        CREATE INDEX IF NOT EXISTS idx_candidates_created ON candidates(created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_status_created ON candidates(status, created_at, id);
+
+        -- Sorting / filtering for the admin report list (expressions must match main.REPORT_SORT_COLUMNS)
+        CREATE INDEX IF NOT EXISTS idx_reports_generated ON reports(generated_at, id);
+        CREATE INDEX IF NOT EXISTS idx_reports_status_generated ON reports(overall_status, generated_at, id);
+        CREATE INDEX IF NOT EXISTS idx_reports_mcq_score ON reports(COALESCE(mcq_score, 0), id);
+        CREATE INDEX IF NOT EXISTS idx_reports_coding_score ON reports(COALESCE(coding_score, 0), id);
+        CREATE INDEX IF NOT EXISTS idx_reports_interview_score ON reports(COALESCE(interview_score, 0), id);
+        CREATE INDEX IF NOT EXISTS idx_reports_status_interview_score ON reports(overall_status, COALESCE(interview_score, 0), id);
+    """)
+
+    for table, column, definition in ADDED_COLUMNS:
+        existing = [info[1] for info in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    # Created after ADDED_COLUMNS so they also apply to older databases
+    cursor.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_candidates_resume_sha256 ON candidates(resume_sha256);
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_resume_ref_insert
+        AFTER INSERT ON candidates WHEN NEW.resume_sha256 IS NOT NULL
+        BEGIN
+            UPDATE resume_blobs SET refcount = refcount + 1 WHERE sha256 = NEW.resume_sha256;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_resume_ref_delete
+        AFTER DELETE ON candidates WHEN OLD.resume_sha256 IS NOT NULL
+        BEGIN
+            UPDATE resume_blobs SET refcount = refcount - 1 WHERE sha256 = OLD.resume_sha256;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_resume_ref_update
+        AFTER UPDATE OF resume_sha256 ON candidates
+        WHEN OLD.resume_sha256 IS NOT NEW.resume_sha256
+        BEGIN
+            UPDATE resume_blobs SET refcount = refcount - 1 WHERE sha256 = OLD.resume_sha256;
+            UPDATE resume_blobs SET refcount = refcount + 1 WHERE sha256 = NEW.resume_sha256;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_skills_insert
+        AFTER INSERT ON candidates WHEN json_valid(NEW.skills)
+        BEGIN
+            INSERT OR IGNORE INTO candidate_skills (skill, candidate_id)
+            SELECT lower(trim(value)), NEW.id FROM json_each(NEW.skills)
+            WHERE type = 'text' AND trim(value) != '';
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_skills_update
+        AFTER UPDATE OF skills ON candidates
+        BEGIN
+            DELETE FROM candidate_skills WHERE candidate_id = NEW.id;
+            INSERT OR IGNORE INTO candidate_skills (skill, candidate_id)
+            SELECT lower(trim(value)), NEW.id
+            FROM json_each(CASE WHEN json_valid(NEW.skills) THEN NEW.skills ELSE '[]' END)
+            WHERE type = 'text' AND trim(value) != '';
+        END;
+
+        -- Also covers connections that run without PRAGMA foreign_keys
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_skills_delete
+        AFTER DELETE ON candidates
+        BEGIN
+            DELETE FROM candidate_skills WHERE candidate_id = OLD.id;
+        END;
+
+        -- Full-text index over name + resume_text. External content: the
+        -- text lives only in candidates, the triggers keep the index in step
+        CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+            name, resume_text,
+            content='candidates', content_rowid='id',
+            tokenize="porter unicode61 tokenchars '+#'"
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_insert
+        AFTER INSERT ON candidates
+        BEGIN
+            INSERT INTO candidates_fts (rowid, name, resume_text) VALUES (NEW.id, NEW.name, NEW.resume_text);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_delete
+        AFTER DELETE ON candidates
+        BEGIN
+            INSERT INTO candidates_fts (candidates_fts, rowid, name, resume_text)
+            VALUES ('delete', OLD.id, OLD.name, OLD.resume_text);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_update
+        AFTER UPDATE OF name, resume_text ON candidates
+        BEGIN
+            INSERT INTO candidates_fts (candidates_fts, rowid, name, resume_text)
+            VALUES ('delete', OLD.id, OLD.name, OLD.resume_text);
+            INSERT INTO candidates_fts (rowid, name, resume_text) VALUES (NEW.id, NEW.name, NEW.resume_text);
+        END;
+    """)
+
+    if "candidate_skills" not in existing_tables:
+        # First run against an existing database: index the candidates already there
+        cursor.execute("""
+            INSERT OR IGNORE INTO candidate_skills (skill, candidate_id)
+            SELECT lower(trim(j.value)), c.id
+            FROM candidates c, json_each(CASE WHEN json_valid(c.skills) THEN c.skills ELSE '[]' END) j
+            WHERE j.type = 'text' AND trim(j.value) != ''
+        """)
+    if "candidates_fts" not in existing_tables:
+        cursor.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild')")
+
+    # Interviews recorded before interview_turns existed only have the
+    # questions_answers blob; give them turn rows so answers can be recorded
+    cursor.execute("""
+        INSERT OR IGNORE INTO interview_turns (interview_id, turn_index, question, question_data, answer, score, evaluation)
+        SELECT i.id, CAST(j.key AS INTEGER),
+               COALESCE(json_extract(j.value, '$.question'), ''),
+               COALESCE(json_extract(j.value, '$.question_data'), '{}'),
+               json_extract(j.value, '$.answer'),
+               json_extract(j.value, '$.score'),
+               json_extract(j.value, '$.evaluation')
+        FROM ai_interviews i,
+             json_each(CASE WHEN json_valid(i.questions_answers) THEN i.questions_answers ELSE '[]' END) j
+        WHERE i.questions_answers IS NOT NULL AND i.questions_answers != '[]'
+          AND NOT EXISTS (SELECT 1 FROM interview_turns t WHERE t.interview_id = i.id)
     """)
 
     # Insert default admin user
@@ -0,0 +1,137 @@
+import io
+import csv
+import json
+import zlib
+
+from database import get_db
+
+EXPORT_BATCH_SIZE = 500
+
+CANDIDATE_EXPORT_COLUMNS = [
+    "id", "name", "email", "phone", "skills", "github_url", "linkedin_url",
+    "coding_platforms", "status", "sql_passed", "created_at",
+]
+
+REPORT_EXPORT_COLUMNS = [
+    "id", "candidate_id", "candidate_name", "candidate_email", "mcq_score", "mcq_passed",
+    "coding_score", "coding_passed", "test1_passed", "interview_score", "interview_passed",
+    "overall_status", "generated_at",
+]
+REPORT_FEEDBACK_COLUMNS = ["detailed_feedback", "proctoring_summary"]
+
+
+def iter_batches(select: str, where: list, params: list, order_key: list, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield lists of rows newest first, one short keyset query per batch.
+
+    Each batch is read to completion before it is yielded, so no read
+    transaction (and no SQLite SHARED lock) stays open while the client
+    downloads; writers are only blocked for the length of one query.
+    order_key is [(sql expression, row key)] for the descending sort, ending
+    with a unique column. Rows written mid-export behind the cursor are not
+    included.
+
+    StreamingResponse advances sync iterators from a threadpool, so the
+    connection is opened without the same-thread check and closed when the
+    iterator is exhausted or the client disconnects.
+    """
+    expressions = [expr for expr, _ in order_key]
+    order_by = ", ".join(f"{expr} DESC" for expr in expressions)
+    conn = get_db(check_same_thread=False)
+    try:
+        last = None
+        while True:
+            conditions = list(where)
+            batch_params = list(params)
+            if last is not None:
+                conditions.append(f"({', '.join(expressions)}) < ({', '.join('?' for _ in expressions)})")
+                batch_params.extend(last)
+            sql = select
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += f" ORDER BY {order_by} LIMIT ?"
+            rows = conn.execute(sql, batch_params + [batch_size]).fetchall()
+            if not rows:
+                break
+            yield rows
+            if len(rows) < batch_size:
+                break
+            last = [rows[-1][key] for _, key in order_key]
+    finally:
+        conn.close()
+
+
+def candidate_record(row) -> dict:
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "email": row["email"],
+        "phone": row["phone"],
+        "skills": json.loads(row["skills"]) if row["skills"] else [],
+        "github_url": row["github_url"],
+        "linkedin_url": row["linkedin_url"],
+        "coding_platforms": json.loads(row["coding_platforms"]) if row["coding_platforms"] else {},
+        "status": row["status"],
+        "sql_passed": bool(row["sql_passed"]),
+        "created_at": row["created_at"],
+    }
+
+
+def report_record(row, include_feedback: bool = False) -> dict:
+    record = {
+        "id": row["id"],
+        "candidate_id": row["candidate_id"],
+        "candidate_name": row["name"],
+        "candidate_email": row["email"],
+        "mcq_score": row["mcq_score"],
+        "mcq_passed": bool(row["mcq_passed"]),
+        "coding_score": row["coding_score"],
+        "coding_passed": bool(row["coding_passed"]),
+        "test1_passed": bool(row["test1_passed"]),
+        "interview_score": row["interview_score"],
+        "interview_passed": bool(row["interview_passed"]),
+        "overall_status": row["overall_status"],
+        "generated_at": row["generated_at"],
+    }
+    if include_feedback:
+        record["detailed_feedback"] = json.loads(row["detailed_feedback"]) if row["detailed_feedback"] else {}
+        record["proctoring_summary"] = json.loads(row["proctoring_summary"]) if row["proctoring_summary"] else {}
+    return record
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ";".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+def csv_chunks(batches, to_record, columns: list):
+    """Encode row batches as CSV, one chunk per batch, header first."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    yield buf.getvalue().encode()
+    for rows in batches:
+        buf.seek(0)
+        buf.truncate()
+        for row in rows:
+            record = to_record(row)
+            writer.writerow([_csv_value(record.get(col)) for col in columns])
+        yield buf.getvalue().encode()
+
+
+def ndjson_chunks(batches, to_record):
+    """Encode row batches as newline-delimited JSON, one chunk per batch."""
+    for rows in batches:
+        yield "".join(json.dumps(to_record(row)) + "\n" for row in rows).encode()
+
+
+def gzip_chunks(chunks, level: int = 6):
+    """Gzip-compress a byte stream on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
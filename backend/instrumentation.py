@@ -0,0 +1,85 @@
+import time
+import asyncio
+
+from starlette.routing import Match, Mount
+
+import metrics
+
+http_requests = metrics.counter("http_requests_total", "HTTP requests by method, route template and status")
+http_latency = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+http_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests currently being served")
+http_response_size = metrics.histogram(
+    "http_response_size_bytes", "HTTP response body size by method and route template",
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+event_loop_lag = metrics.histogram(
+    "event_loop_lag_seconds", "Delay between when a periodic asyncio timer was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+EVENT_LOOP_LAG_INTERVAL = 0.5
+
+
+def route_template(scope) -> str:
+    """The path template a request will be routed to, e.g. /api/admin/candidates/{candidate_id}.
+
+    Labelling by template rather than raw path keeps metric cardinality bounded.
+    """
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{route.path}/{{path}}" if isinstance(route, Mount) else route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording count, latency, in-flight and response size per route template.
+
+    Wraps send rather than the response object so streamed bodies are
+    measured in full; latency for streaming routes covers the whole stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = {"method": scope["method"], "route": route_template(scope)}
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc(**labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec(**labels)
+            http_latency.observe(time.perf_counter() - started, **labels)
+            http_response_size.observe(size, **labels)
+            http_requests.inc(status=str(status), **labels)
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL):
+    """Sleep in a loop and record how late each wake-up is; blocking calls show up as lag."""
+    loop = asyncio.get_running_loop()
+    while True:
+        due = loop.time() + interval
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(loop.time() - due, 0.0))
@@ -0,0 +1,45 @@
+import json
+from datetime import datetime
+
+
+def load_interview_qa(db, interview) -> list:
+    """Return an interview's Q&A list in the legacy questions_answers shape.
+
+    Turns come from the interview_qa_legacy view over interview_turns.
+    Interviews recorded before turns existed fall back to the old blob.
+    """
+    row = db.execute(
+        "SELECT questions_answers FROM interview_qa_legacy WHERE interview_id = ?",
+        (interview["id"],)
+    ).fetchone()
+    if row:
+        return json.loads(row["questions_answers"])
+    legacy = interview["questions_answers"]
+    return json.loads(legacy) if legacy else []
+
+
+def start_turns(db, interview_id: int, question_data: dict):
+    """Reset an interview's turns and record its first question."""
+    db.execute("DELETE FROM interview_turns WHERE interview_id = ?", (interview_id,))
+    append_turn(db, interview_id, 0, question_data)
+
+
+def append_turn(db, interview_id: int, turn_index: int, question_data: dict):
+    """Record a newly asked question. Raises sqlite3.IntegrityError if the turn exists."""
+    db.execute(
+        """INSERT INTO interview_turns (interview_id, turn_index, question, question_data, asked_at)
+           VALUES (?, ?, ?, ?, ?)""",
+        (interview_id, turn_index, question_data["question"], json.dumps(question_data),
+         datetime.utcnow().isoformat())
+    )
+
+
+def record_answer(db, interview_id: int, turn_index: int, answer: str, evaluation: dict) -> bool:
+    """Fill in the answer for a turn. Returns False if the turn was already answered."""
+    cursor = db.execute(
+        """UPDATE interview_turns SET answer = ?, score = ?, evaluation = ?, answered_at = ?
+           WHERE interview_id = ? AND turn_index = ? AND answer IS NULL""",
+        (answer, evaluation.get("score", 5), json.dumps(evaluation), datetime.utcnow().isoformat(),
+         interview_id, turn_index)
+    )
+    return cursor.rowcount == 1
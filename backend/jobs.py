@@ -0,0 +1,245 @@
+import os
+import json
+import uuid
+import socket
+import asyncio
+from datetime import datetime, timedelta
+
+from database import get_db
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2.0"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5.0"))
+# A running job whose heartbeat is older than this is presumed orphaned and requeued
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Identifies this process's claims, so several processes can share one jobs table
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_handlers = {}
+_workers = []
+_wakeup = None
+
+
+class JobFailed(Exception):
+    """Raised by a handler for errors that retrying will not fix."""
+
+
+def job_handler(job_type: str):
+    """Register a coroutine `handler(payload) -> result` for a job type."""
+    def decorator(fn):
+        _handlers[job_type] = fn
+        return fn
+    return decorator
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _job_dict(row) -> dict:
+    return {
+        "id": row["id"],
+        "job_type": row["job_type"],
+        "payload": json.loads(row["payload"]) if row["payload"] else {},
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "max_attempts": row["max_attempts"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "locked_by": row["locked_by"],
+        "heartbeat_at": row["heartbeat_at"],
+    }
+
+
+def enqueue_job(job_type: str, payload: dict, max_attempts: int = None) -> int:
+    """Persist a queued job and wake an idle worker. Returns the job id."""
+    if job_type not in _handlers:
+        raise ValueError(f"No handler registered for job type '{job_type}'")
+    db = get_db()
+    now = _now()
+    cursor = db.execute(
+        """INSERT INTO jobs (job_type, payload, status, max_attempts, run_after, created_at)
+           VALUES (?, ?, 'queued', ?, ?, ?)""",
+        (job_type, json.dumps(payload), max_attempts or JOB_MAX_ATTEMPTS, now, now)
+    )
+    db.commit()
+    job_id = cursor.lastrowid
+    db.close()
+    if _wakeup is not None:
+        _wakeup.set()
+    return job_id
+
+
+def get_job(job_id: int):
+    db = get_db()
+    row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    db.close()
+    return _job_dict(row) if row else None
+
+
+def list_jobs(status: str = None, limit: int = 50) -> list:
+    db = get_db()
+    if status:
+        rows = db.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    db.close()
+    return [_job_dict(r) for r in rows]
+
+
+def _claim_next_job():
+    """Atomically move the oldest runnable job from queued to running."""
+    db = get_db()
+    try:
+        db.execute("BEGIN IMMEDIATE")
+        row = db.execute(
+            "SELECT * FROM jobs WHERE status = 'queued' AND run_after <= ? ORDER BY id LIMIT 1",
+            (_now(),)
+        ).fetchone()
+        if not row:
+            db.rollback()
+            return None
+        now = _now()
+        db.execute(
+            """UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?,
+               locked_by = ?, heartbeat_at = ? WHERE id = ?""",
+            (now, WORKER_ID, now, row["id"])
+        )
+        db.commit()
+        job = _job_dict(row)
+        job["attempts"] += 1
+        return job
+    finally:
+        db.close()
+
+
+def _finish_job(job_id: int, status: str, result=None, error: str = None, run_after: str = None):
+    """Release this worker's lease; a no-op if the job has since been reclaimed by another worker."""
+    db = get_db()
+    if status == "queued":
+        db.execute(
+            """UPDATE jobs SET status = 'queued', error = ?, run_after = ?, locked_by = NULL
+               WHERE id = ? AND locked_by = ?""",
+            (error, run_after, job_id, WORKER_ID)
+        )
+    else:
+        db.execute(
+            """UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, locked_by = NULL
+               WHERE id = ? AND locked_by = ?""",
+            (status, json.dumps(result) if result is not None else None, error, _now(), job_id, WORKER_ID)
+        )
+    db.commit()
+    db.close()
+
+
+def _reclaim_expired_jobs() -> int:
+    """Requeue running jobs whose lease has lapsed (their worker died). Returns how many.
+
+    A job that has already used all its attempts is failed instead, so one
+    that takes its process down every time does not loop forever.
+    """
+    current = datetime.utcnow()
+    now = current.isoformat()
+    expired_before = (current - timedelta(seconds=JOB_LEASE_SECONDS)).isoformat()
+    expired = "status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)"
+    db = get_db()
+    failed = db.execute(
+        f"""UPDATE jobs SET status = 'failed', finished_at = ?, locked_by = NULL,
+               error = 'Lease expired on the final attempt'
+           WHERE {expired} AND attempts >= max_attempts""",
+        (now, expired_before)
+    ).rowcount
+    requeued = db.execute(
+        f"""UPDATE jobs SET status = 'queued', run_after = ?, locked_by = NULL, error = 'Lease expired'
+           WHERE {expired}""",
+        (now, expired_before)
+    ).rowcount
+    db.commit()
+    db.close()
+    return failed + requeued
+
+
+async def _heartbeat(job_id: int):
+    """Renew the lease on a running job until cancelled."""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        db = get_db()
+        try:
+            db.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND locked_by = ?", (_now(), job_id, WORKER_ID))
+            db.commit()
+        except Exception as e:
+            print(f"Job {job_id} heartbeat failed: {e}")
+        finally:
+            db.close()
+
+
+async def _run_job(job: dict):
+    handler = _handlers.get(job["job_type"])
+    if handler is None:
+        _finish_job(job["id"], "failed", error=f"No handler for job type '{job['job_type']}'")
+        return
+    heartbeat = asyncio.create_task(_heartbeat(job["id"]))
+    try:
+        result = await handler(job["payload"])
+        _finish_job(job["id"], "succeeded", result=result)
+    except asyncio.CancelledError:
+        # Shutdown mid-job: hand it back to the queue for the next process
+        _finish_job(job["id"], "queued", error="Interrupted by shutdown", run_after=_now())
+        raise
+    except JobFailed as e:
+        _finish_job(job["id"], "failed", error=str(e))
+    except Exception as e:
+        print(f"Job {job['id']} ({job['job_type']}) attempt {job['attempts']} failed: {e}")
+        if job["attempts"] < job["max_attempts"]:
+            delay = JOB_RETRY_BASE_SECONDS * (2 ** (job["attempts"] - 1))
+            run_after = (datetime.utcnow() + timedelta(seconds=delay)).isoformat()
+            _finish_job(job["id"], "queued", error=str(e), run_after=run_after)
+        else:
+            _finish_job(job["id"], "failed", error=str(e))
+    finally:
+        heartbeat.cancel()
+
+
+async def _worker():
+    while True:
+        try:
+            job = _claim_next_job()
+            if job is None:
+                _reclaim_expired_jobs()
+                _wakeup.clear()
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await _run_job(job)
+        except Exception as e:
+            # e.g. "database is locked": keep the worker alive and try again shortly
+            print(f"Job worker error: {e}")
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+
+def start_workers(concurrency: int = None):
+    """Start in-process workers.
+
+    Jobs left 'running' by a crashed process are requeued once their lease
+    expires (JOB_LEASE_SECONDS without a heartbeat); jobs other live
+    processes are working on keep their lease.
+    """
+    global _wakeup
+    _wakeup = asyncio.Event()
+    _reclaim_expired_jobs()
+    for _ in range(concurrency or JOB_WORKER_CONCURRENCY):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+async def stop_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
@@ -1,10 +1,15 @@
 import os
+import re
 import json
+import time
 import shutil
+import sqlite3
+import asyncio
+import hashlib
+import tempfile
 import httpx
 from datetime import datetime, timedelta
-from typing import Optional
-from io import BytesIO
+from typing import Optional, List
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,17 +17,43 @@ load_dotenv()
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from database import get_db, init_db
 from resume_parser import ResumeParser
+from pagination import encode_cursor, decode_cursor, parse_fields
+import metrics
+import tts_cache
+from instrumentation import MetricsMiddleware, monitor_event_loop_lag
+from body_limit import BodySizeLimitMiddleware
+import resume_store
+import matching
+from interview_store import load_interview_qa, start_turns, append_turn, record_answer
+from jobs import job_handler, JobFailed, enqueue_job, get_job, list_jobs, start_workers, stop_workers
+from exports import (
+    CANDIDATE_EXPORT_COLUMNS,
+    REPORT_EXPORT_COLUMNS,
+    REPORT_FEEDBACK_COLUMNS,
+    iter_batches,
+    candidate_record,
+    report_record,
+    csv_chunks,
+    ndjson_chunks,
+    gzip_chunks,
+)
 from ai_service import (
     generate_mcq_questions,
     generate_coding_problems,
     generate_interview_question,
+    stream_interview_question,
     evaluate_interview_answer,
     generate_final_report,
+    build_resume_digest,
+    summarize_interview_turn,
+    INTERVIEW_PROMPT_TOKEN_BUDGET,
+    LLM_ERRORS,
 )
 
 # Initialize
@@ -35,22 +66,47 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+MAX_RESUME_UPLOAD_BYTES = int(os.getenv("MAX_RESUME_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 256 * 1024
+# An upload's .part file untouched for this long was abandoned
+UPLOAD_TEMP_MAX_AGE_SECONDS = 15 * 60
+# Room for the multipart boundaries and the name/email form fields
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
+# Reject oversized uploads before Starlette spools the body to disk
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={"/api/admin/upload-resume": MAX_RESUME_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD_BYTES},
+)
+app.add_middleware(MetricsMiddleware)
 
 DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY", "")
 
+_loop_lag_task = None  # samples event-loop lag for /metrics
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup():
+    global _loop_lag_task
     init_db()
+    start_workers()
+    _loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_workers()
+    if _loop_lag_task is not None:
+        _loop_lag_task.cancel()
 
 
 # ──────────────── Pydantic Models ────────────────
 
 class TTSRequest(BaseModel):
     text: str
+    voice: Optional[str] = None
 
 class LoginRequest(BaseModel):
     username: str
@@ -93,6 +149,13 @@ class RunCode(BaseModel):
 class RunSQL(BaseModel):
     query: str
 
+class MatchRequest(BaseModel):
+    job_description: str = ""
+    skills: Optional[List[str]] = None  # defaults to the skills found in job_description
+    top_k: int = 20
+    status: Optional[str] = None
+    refresh: bool = False
+
 
 # ──────────────── Auth Routes ────────────────
 
@@ -134,6 +197,35 @@ async def candidate_login(req: CandidateAccess):
 
 # ──────────────── Resume Upload & Parsing ────────────────
 
+async def _stream_upload_to_disk(file: UploadFile, max_bytes: int) -> tuple:
+    """Copy an upload to a temp file in UPLOAD_DIR chunk by chunk, hashing as it goes.
+
+    Returns (temp_path, size, sha256 hex). Raises 413 as soon as the upload
+    passes max_bytes, so at most one chunk is ever held in memory.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Resume is larger than the {max_bytes:,}-byte upload limit")
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Resume is larger than the {max_bytes:,}-byte upload limit")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path, size, digest.hexdigest()
+
+
 @app.post("/api/admin/upload-resume")
 async def upload_resume(
     file: UploadFile = File(...),
@@ -143,15 +235,27 @@ async def upload_resume(
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
 
-    # Save file
-    file_bytes = await file.read()
-    file_path = os.path.join(UPLOAD_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}")
-    with open(file_path, "wb") as f:
-        f.write(file_bytes)
+    # Save file (identical resumes share one content-addressed blob)
+    temp_path, size, resume_sha256 = await _stream_upload_to_disk(file, MAX_RESUME_UPLOAD_BYTES)
+    db = get_db()
+    file_path = resume_store.put_blob(db, UPLOAD_DIR, temp_path, resume_sha256, size)
+    db.commit()
+
+    def discard_blob():
+        # Drop this upload's reference; the blob goes unless another candidate uses it
+        resume_store.release_blob(db, resume_sha256)
+        db.commit()
+        resume_store.collect_garbage(db, UPLOAD_DIR, resume_sha256)
+        db.close()
 
-    # Parse resume
-    parsed = ResumeParser.parse_resume(file_bytes=file_bytes)
+    # Parse resume (CPU-bound, so off the event loop)
+    try:
+        parsed = await run_in_threadpool(ResumeParser.parse_resume, file_path=file_path)
+    except BaseException:
+        discard_blob()
+        raise
     if "error" in parsed:
+        discard_blob()
         raise HTTPException(status_code=400, detail=parsed["error"])
 
     # Use provided name/email or extracted ones
@@ -159,19 +263,20 @@ async def upload_resume(
     candidate_email = email or parsed.get("email", "")
 
     if not candidate_email:
+        discard_blob()
         raise HTTPException(status_code=400, detail="Email is required. Please provide email or ensure it's in the resume.")
 
     # Save to database
-    db = get_db()
     try:
         cursor = db.execute(
-            """INSERT INTO candidates (name, email, phone, resume_path, resume_text, skills, github_url, linkedin_url, coding_platforms, status)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')""",
+            """INSERT INTO candidates (name, email, phone, resume_path, resume_sha256, resume_text, skills, github_url, linkedin_url, coding_platforms, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')""",
             (
                 candidate_name,
                 candidate_email,
                 parsed.get("phone", ""),
                 file_path,
+                resume_sha256,
                 parsed.get("resume_text", ""),
                 json.dumps(parsed.get("skills", [])),
                 parsed.get("github_url", ""),
@@ -179,10 +284,13 @@ async def upload_resume(
                 json.dumps(parsed.get("coding_platforms", {})),
             )
         )
+        # The candidate row now holds its own reference (trigger); hand ours back
+        resume_store.release_blob(db, resume_sha256)
         db.commit()
         candidate_id = cursor.lastrowid
     except Exception as e:
-        db.close()
+        db.rollback()
+        discard_blob()
         if "UNIQUE constraint" in str(e):
             raise HTTPException(status_code=400, detail="A candidate with this email already exists.")
         raise HTTPException(status_code=500, detail=str(e))
@@ -191,6 +299,7 @@ async def upload_resume(
     return {
         "success": True,
         "candidate_id": candidate_id,
+        "resume_sha256": resume_sha256,
         "parsed_data": {
             "name": candidate_name,
             "email": candidate_email,
@@ -205,26 +314,80 @@ async def upload_resume(
 
 # ──────────────── Candidate Management ────────────────
 
+CANDIDATE_LIST_FIELDS = {
+    "id", "name", "email", "phone", "skills", "github_url", "linkedin_url",
+    "coding_platforms", "status", "sql_passed", "created_at", "updated_at",
+}
+CANDIDATE_LIST_DEFAULT_FIELDS = [
+    "id", "name", "email", "phone", "skills", "github_url", "linkedin_url",
+    "coding_platforms", "status", "created_at",
+]
+CANDIDATE_JSON_FIELDS = {"skills", "coding_platforms"}
+
+
 @app.get("/api/admin/candidates")
-async def get_candidates():
+async def get_candidates(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    skill: List[str] = Query([]),
+    q: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """List candidates newest first using keyset pagination on (created_at, id).
+
+    q matches a substring of the name or email (case-insensitive) or one
+    skill exactly. resume_text is never selected here; fetch a single
+    candidate for it.
+    """
+    columns = parse_fields(fields, CANDIDATE_LIST_FIELDS, CANDIDATE_LIST_DEFAULT_FIELDS, ["id", "created_at"])
+
+    where, params = [], []
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, 2)
+        where.append("(c.created_at, c.id) < (?, ?)")
+        params.extend([created_at, last_id])
+    if status:
+        where.append("c.status = ?")
+        params.append(status)
+    for s in skill:
+        where.append("EXISTS (SELECT 1 FROM candidate_skills cs WHERE cs.skill = ? AND cs.candidate_id = c.id)")
+        params.append(s.strip().lower())
+    if q and q.strip():
+        term = q.strip()
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        where.append(
+            "(c.name LIKE ? ESCAPE '\\' OR c.email LIKE ? ESCAPE '\\'"
+            " OR EXISTS (SELECT 1 FROM candidate_skills cs WHERE cs.skill = ? AND cs.candidate_id = c.id))"
+        )
+        params.extend([pattern, pattern, term.lower()])
+
+    sql = f"SELECT {', '.join('c.' + col for col in columns)} FROM candidates c"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY c.created_at DESC, c.id DESC LIMIT ?"
+    params.append(limit + 1)
+
     db = get_db()
-    candidates = db.execute("SELECT * FROM candidates ORDER BY created_at DESC").fetchall()
+    rows = db.execute(sql, params).fetchall()
     db.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     result = []
-    for c in candidates:
-        result.append({
-            "id": c["id"],
-            "name": c["name"],
-            "email": c["email"],
-            "phone": c["phone"],
-            "skills": json.loads(c["skills"]),
-            "github_url": c["github_url"],
-            "linkedin_url": c["linkedin_url"],
-            "coding_platforms": json.loads(c["coding_platforms"]),
-            "status": c["status"],
-            "created_at": c["created_at"],
-        })
-    return {"candidates": result}
+    for c in rows:
+        item = {}
+        for col in columns:
+            value = c[col]
+            if col in CANDIDATE_JSON_FIELDS:
+                value = json.loads(value) if value else ({} if col == "coding_platforms" else [])
+            elif col == "sql_passed":
+                value = bool(value)
+            item[col] = value
+        result.append(item)
+
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None
+    return {"candidates": result, "next_cursor": next_cursor, "has_more": has_more}
 
 
 @app.get("/api/admin/candidates/{candidate_id}")
@@ -241,6 +404,9 @@ async def get_candidate(candidate_id: int):
     interview = db.execute("SELECT * FROM ai_interviews WHERE candidate_id = ? ORDER BY created_at DESC LIMIT 1", (candidate_id,)).fetchone()
     report = db.execute("SELECT * FROM reports WHERE candidate_id = ?", (candidate_id,)).fetchone()
     violations = db.execute("SELECT * FROM proctoring_logs WHERE candidate_id = ? ORDER BY timestamp DESC", (candidate_id,)).fetchall()
+    if interview:
+        interview = dict(interview)
+        interview["questions_answers"] = json.dumps(load_interview_qa(db, interview))
 
     db.close()
 
@@ -260,7 +426,7 @@ async def get_candidate(candidate_id: int):
         },
         "mcq_test": dict(mcq) if mcq else None,
         "coding_test": dict(coding) if coding else None,
-        "interview": dict(interview) if interview else None,
+        "interview": interview,
         "report": dict(report) if report else None,
         "violations": [dict(v) for v in violations],
     }
@@ -269,26 +435,242 @@ async def get_candidate(candidate_id: int):
 @app.delete("/api/admin/candidates/{candidate_id}")
 async def delete_candidate(candidate_id: int):
     db = get_db()
+    row = db.execute("SELECT resume_sha256 FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
     db.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
     db.commit()
+    if row and row["resume_sha256"]:
+        resume_store.collect_garbage(db, UPLOAD_DIR, row["resume_sha256"])
     db.close()
     return {"success": True}
 
 
+# ──────────────── Search ────────────────
+
+def _skill_search_hits(db, skills: list, match: str, status: Optional[str], after: Optional[list], limit: int) -> list:
+    """(candidate_id, matches, matched skills) ranked by matches, then newest candidate id."""
+    placeholders = ", ".join("?" for _ in skills)
+    status_filter = " AND {col} IN (SELECT id FROM candidates WHERE status = ?)" if status else ""
+
+    if match == "all":
+        # Walk the rarest skill's postings newest-first and probe the others,
+        # so the scan stops as soon as the page is full
+        counts = dict(db.execute(
+            f"SELECT skill, COUNT(*) FROM candidate_skills WHERE skill IN ({placeholders}) GROUP BY skill", skills
+        ).fetchall())
+        if len(counts) < len(skills):
+            return []
+        rarest = min(skills, key=lambda s: counts[s])
+        sql = "SELECT a.candidate_id FROM candidate_skills a WHERE a.skill = ?"
+        params = [rarest]
+        for other in skills:
+            if other != rarest:
+                sql += " AND EXISTS (SELECT 1 FROM candidate_skills b WHERE b.skill = ? AND b.candidate_id = a.candidate_id)"
+                params.append(other)
+        if status:
+            sql += status_filter.format(col="a.candidate_id")
+            params.append(status)
+        if after:
+            sql += " AND a.candidate_id < ?"
+            params.append(after[1])
+        sql += " ORDER BY a.candidate_id DESC LIMIT ?"
+        params.append(limit)
+        return [(r[0], len(skills), skills) for r in db.execute(sql, params).fetchall()]
+
+    # Ranking by overlap needs every candidate with at least one of the skills
+    sql = f"""
+        WITH hits AS (
+            SELECT candidate_id, COUNT(*) AS matches, group_concat(skill, ',') AS matched
+            FROM candidate_skills
+            WHERE skill IN ({placeholders}){status_filter.format(col="candidate_id")}
+            GROUP BY candidate_id
+        )
+        SELECT candidate_id, matches, matched FROM hits
+    """
+    params = list(skills) + ([status] if status else [])
+    if after:
+        sql += " WHERE (matches, candidate_id) < (?, ?)"
+        params.extend(after)
+    sql += " ORDER BY matches DESC, candidate_id DESC LIMIT ?"
+    params.append(limit)
+    return [(r[0], r[1], sorted(r[2].split(","))) for r in db.execute(sql, params).fetchall()]
+
+
+@app.get("/api/admin/search/candidates")
+async def search_candidates(
+    skill: List[str] = Query([]),
+    match: str = "all",
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    """Find candidates by skill through the candidate_skills index.
+
+    match=all requires every skill, match=any at least one. Results are
+    ranked by how many of the requested skills each candidate has, then
+    newest first (by id), with keyset pagination on (matches, id).
+    """
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="match must be 'all' or 'any'")
+    skills = sorted({s.strip().lower() for s in skill if s.strip()})
+    if not skills:
+        raise HTTPException(status_code=400, detail="At least one skill is required")
+    after = decode_cursor(cursor, 2) if cursor else None
+
+    db = get_db()
+    hits = _skill_search_hits(db, skills, match, status, after, limit + 1)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+    details = {}
+    if hits:
+        ids = [h[0] for h in hits]
+        details = {r["id"]: r for r in db.execute(
+            f"SELECT id, name, email, status, skills, created_at FROM candidates WHERE id IN ({', '.join('?' for _ in ids)})",
+            ids
+        ).fetchall()}
+    db.close()
+
+    result = []
+    for candidate_id, matches, matched in hits:
+        c = details.get(candidate_id)
+        if c is None:
+            continue
+        result.append({
+            "id": c["id"],
+            "name": c["name"],
+            "email": c["email"],
+            "status": c["status"],
+            "skills": json.loads(c["skills"]) if c["skills"] else [],
+            "matched_skills": matched,
+            "match_count": matches,
+            "created_at": c["created_at"],
+        })
+
+    next_cursor = encode_cursor(hits[-1][1], hits[-1][0]) if has_more else None
+    return {"candidates": result, "next_cursor": next_cursor, "has_more": has_more}
+
+
+RESUME_SEARCH_WEIGHTS = (2.0, 1.0)  # bm25 weights for (name, resume_text)
+
+
+def _fts_quote_terms(q: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms (implicit AND)."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+@app.get("/api/admin/search/resumes")
+async def search_resumes(
+    q: str,
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+):
+    """Full-text search over candidate names and resume text via candidates_fts.
+
+    q accepts FTS5 syntax (phrases, OR, NOT, prefix*); anything that does not
+    parse is searched as plain terms. Results are ranked by BM25 with a
+    highlighted snippet, keyset-paginated on (rank, id).
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q is required")
+
+    rank = f"bm25(candidates_fts, {', '.join(str(w) for w in RESUME_SEARCH_WEIGHTS)})"
+    where, params = ["candidates_fts MATCH ?"], []
+    if status:
+        where.append("c.status = ?")
+        params.append(status)
+    if cursor:
+        last_rank, last_id = decode_cursor(cursor, 2)
+        where.append(f"({rank} > ? OR ({rank} = ? AND c.id > ?))")
+        params.extend([last_rank, last_rank, last_id])
+    sql = f"""
+        SELECT c.id, c.name, c.email, c.status, c.created_at, {rank} AS rank,
+               snippet(candidates_fts, 1, '<mark>', '</mark>', '…', 24) AS snippet
+        FROM candidates_fts JOIN candidates c ON c.id = candidates_fts.rowid
+        WHERE {' AND '.join(where)}
+        ORDER BY rank, c.id
+        LIMIT ?
+    """
+    params.append(limit + 1)
+
+    db = get_db()
+    try:
+        rows = db.execute(sql, [q, *params]).fetchall()
+    except sqlite3.OperationalError:
+        rows = db.execute(sql, [_fts_quote_terms(q), *params]).fetchall()
+    finally:
+        db.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    result = [{
+        "id": r["id"],
+        "name": r["name"],
+        "email": r["email"],
+        "status": r["status"],
+        "created_at": r["created_at"],
+        "score": -r["rank"],
+        "snippet": r["snippet"],
+    } for r in rows]
+
+    next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"]) if has_more else None
+    return {"results": result, "next_cursor": next_cursor, "has_more": has_more}
+
+
+@app.post("/api/admin/match/candidates")
+async def match_candidates(req: MatchRequest):
+    """Rank the candidate pool against a job description, locally.
+
+    Scores are the weighted cosine similarity of TF-IDF skill and resume-text
+    vectors (see matching.py). The vectors are cached and rebuilt in the
+    background when candidates are added or removed, so results can lag the
+    latest uploads briefly; refresh=true waits for a full rebuild.
+    """
+    if not 1 <= req.top_k <= 500:
+        raise HTTPException(status_code=400, detail="top_k must be between 1 and 500")
+    skills = matching.job_skills(req.job_description, req.skills)
+    if not skills and not req.job_description.strip():
+        raise HTTPException(status_code=400, detail="Provide a job_description or skills")
+
+    db = get_db()
+    index = await matching.get_index(db, refresh=req.refresh)
+    allowed = None
+    if req.status:
+        allowed = {r[0] for r in db.execute("SELECT id FROM candidates WHERE status = ?", (req.status,))}
+    top = index.top_k(skills, req.job_description, req.top_k, allowed)
+    details = {}
+    if top:
+        ids = [candidate_id for candidate_id, _, _ in top]
+        details = {r["id"]: r for r in db.execute(
+            f"SELECT id, name, email, status FROM candidates WHERE id IN ({', '.join('?' for _ in ids)})", ids
+        ).fetchall()}
+    db.close()
+
+    return {
+        "job_skills": skills,
+        "pool_size": len(index.ids),
+        "candidates": [{
+            "id": candidate_id,
+            "name": details[candidate_id]["name"],
+            "email": details[candidate_id]["email"],
+            "status": details[candidate_id]["status"],
+            "score": round(score, 4),
+            "matched_skills": matched,
+        } for candidate_id, score, matched in top if candidate_id in details],
+    }
+
+
 # ──────────────── Test Generation ────────────────
 
-@app.post("/api/admin/generate-test/{candidate_id}")
-async def generate_test(candidate_id: int):
-    """Generate MCQ + Coding test for a candidate."""
+async def _generate_test(candidate_id: int) -> dict:
+    """Generate and store MCQ + coding tests for one candidate."""
     db = get_db()
-    candidate = db.execute("SELECT * FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+    candidate = db.execute("SELECT skills FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+    db.close()
     if not candidate:
-        db.close()
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     skills = json.loads(candidate["skills"])
     if not skills:
-        db.close()
         raise HTTPException(status_code=400, detail="No skills found. Please ensure resume has extractable skills.")
 
     # Generate MCQ questions
@@ -297,6 +679,11 @@ async def generate_test(candidate_id: int):
     # Generate coding problems
     coding_problems = await generate_coding_problems(skills, count=3)
 
+    return _store_generated_test(candidate_id, mcq_questions, coding_problems)
+
+
+def _store_generated_test(candidate_id: int, mcq_questions: list, coding_problems: list) -> dict:
+    db = get_db()
     # Save MCQ test
     cursor = db.execute(
         """INSERT INTO mcq_tests (candidate_id, questions, total_marks, passing_score, status)
@@ -327,6 +714,108 @@ async def generate_test(candidate_id: int):
     }
 
 
+@app.post("/api/admin/generate-test/{candidate_id}")
+async def generate_test(candidate_id: int, background: bool = False):
+    """Generate MCQ + Coding test for a candidate.
+
+    With background=true the work is queued and a job id is returned
+    immediately; poll /api/admin/jobs/{job_id} for the result.
+    """
+    if background:
+        _require_candidate(candidate_id)
+        job_id = enqueue_job("generate_test", {"candidate_id": candidate_id})
+        return {"success": True, "job_id": job_id, "status": "queued"}
+    return await _generate_test(candidate_id)
+
+
+# ──────────────── Bulk Test Generation ────────────────
+
+class BulkGenerateRequest(BaseModel):
+    status: str = "pending"
+    limit: Optional[int] = None
+    concurrency: int = 4
+
+
+def _skill_set_key(skills: list) -> tuple:
+    """Candidates with the same skills in any order or case share one generated test."""
+    return tuple(sorted({s.strip().lower() for s in skills}))
+
+
+@app.post("/api/admin/bulk/generate-tests")
+async def bulk_generate_tests(req: BulkGenerateRequest):
+    """Generate tests for every candidate in a status, streaming NDJSON progress.
+
+    Candidates with an identical skill list share one MCQ/coding generation,
+    and all LLM traffic still goes through ai_service's global limit.
+    """
+    sql = "SELECT id, skills FROM candidates WHERE status = ? ORDER BY created_at, id"
+    params = [req.status]
+    if req.limit:
+        sql += " LIMIT ?"
+        params.append(req.limit)
+    db = get_db()
+    candidates = db.execute(sql, params).fetchall()
+    db.close()
+
+    generations = {}  # _skill_set_key -> task producing (mcq_questions, coding_problems)
+    candidate_slots = asyncio.Semaphore(max(1, req.concurrency))
+    events = asyncio.Queue()
+
+    async def generate_for_skills(skills: list):
+        return await asyncio.gather(
+            generate_mcq_questions(skills, count=20),
+            generate_coding_problems(skills, count=3),
+        )
+
+    async def process(candidate_id: int, skills: list):
+        if not skills:
+            await events.put({"event": "candidate", "candidate_id": candidate_id, "status": "skipped",
+                              "detail": "No skills found"})
+            return
+        async with candidate_slots:
+            key = _skill_set_key(skills)
+            reused = key in generations
+            if not reused:
+                generations[key] = asyncio.ensure_future(generate_for_skills(skills))
+            try:
+                mcq_questions, coding_problems = await asyncio.shield(generations[key])
+                result = _store_generated_test(candidate_id, mcq_questions, coding_problems)
+                await events.put({"event": "candidate", "candidate_id": candidate_id, "status": "generated",
+                                  "reused": reused, "mcq_test_id": result["mcq_test_id"],
+                                  "coding_test_id": result["coding_test_id"]})
+            except Exception as e:
+                await events.put({"event": "candidate", "candidate_id": candidate_id, "status": "failed",
+                                  "detail": str(e)})
+
+    async def progress():
+        started = datetime.utcnow()
+        total = len(candidates)
+        unique = len({_skill_set_key(json.loads(c["skills"])) for c in candidates})
+        yield json.dumps({"event": "started", "total": total, "unique_skill_sets": unique}) + "\n"
+
+        tasks = [asyncio.ensure_future(process(c["id"], json.loads(c["skills"]))) for c in candidates]
+        counts = {"generated": 0, "failed": 0, "skipped": 0}
+        try:
+            for done in range(1, total + 1):
+                event = await events.get()
+                counts[event["status"]] += 1
+                event.update({"done": done, "total": total})
+                yield json.dumps(event) + "\n"
+        finally:
+            # Client went away (or we finished): stop any outstanding work
+            for t in tasks + list(generations.values()):
+                t.cancel()
+
+        yield json.dumps({
+            "event": "finished",
+            **counts,
+            "llm_generations": len(generations),
+            "elapsed_seconds": round((datetime.utcnow() - started).total_seconds(), 2),
+        }) + "\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
 # ──────────────── Student Test Routes ────────────────
 
 @app.get("/api/student/test-info/{candidate_id}")
@@ -701,8 +1190,115 @@ async def finish_coding_test(test_id: int):
 
 # ──────────────── AI Interview Routes ────────────────
 
-@app.post("/api/student/start-interview/{interview_id}")
-async def start_interview(interview_id: int):
+# Generate question N+1 in the background while the candidate answers question N.
+# Opt-in: a prefetched question cannot follow up on the answer to question N.
+INTERVIEW_SPECULATIVE_PREFETCH = os.getenv("INTERVIEW_SPECULATIVE_PREFETCH", "0") == "1"
+_prefetch_tasks = {}  # interview_id -> (context_key, asyncio.Task)
+
+
+def _interview_profile(candidate, interview) -> dict:
+    return {
+        "skills": json.loads(candidate["skills"]),
+        "resume_text": candidate["resume_text"] or "",
+        "github_url": candidate["github_url"] or "",
+        "coding_platforms": json.loads(candidate["coding_platforms"]) if candidate["coding_platforms"] else {},
+        "total_questions": interview["total_questions"],
+        "resume_digest": interview["resume_digest"],
+        "context_summary": json.loads(interview["context_summary"]) if interview["context_summary"] else [],
+    }
+
+
+def _interview_context_key(qa_list: list, question_number: int) -> str:
+    """Fingerprint of the adaptive context a question is generated from.
+
+    A prefetched question is only served if the interview history it was
+    built on is unchanged when the candidate's answer arrives. The pending
+    answer is deliberately not part of the key (it does not exist yet when
+    the prefetch starts), so a served prefetch never reflects it.
+    """
+    context = [question_number] + [[qa.get("question"), qa.get("answer")] for qa in qa_list]
+    return hashlib.sha256(json.dumps(context, default=str).encode()).hexdigest()
+
+
+async def _generate_question_for(profile: dict, previous_qa: list, question_number: int, on_delta=None,
+                                 purpose: str = "interview_question") -> dict:
+    """Generate a question; with on_delta, stream its text to the callback as it is produced."""
+    kwargs = dict(
+        skills=profile["skills"],
+        resume_text=profile["resume_text"],
+        previous_qa=previous_qa,
+        question_number=question_number,
+        total_questions=profile["total_questions"],
+        github_url=profile["github_url"],
+        coding_platforms=profile["coding_platforms"],
+        resume_digest=profile["resume_digest"],
+        context_summary=profile["context_summary"],
+    )
+    if on_delta is None:
+        return await generate_interview_question(**kwargs, purpose=purpose)
+    question_data = None
+    async for kind, value in stream_interview_question(**kwargs):
+        if kind == "delta":
+            on_delta(value)
+        else:
+            question_data = value
+    return question_data
+
+
+def _schedule_question_prefetch(interview_id: int, profile: dict, qa_list: list, question_number: int):
+    """Start generating the question after the current one from the context we already have."""
+    if not INTERVIEW_SPECULATIVE_PREFETCH or question_number > profile["total_questions"]:
+        return
+    context_key = _interview_context_key(qa_list, question_number)
+    previous_qa = [dict(qa) for qa in qa_list]
+
+    async def prefetch():
+        question_data = await _generate_question_for(profile, previous_qa, question_number,
+                                                     purpose="interview_prefetch")
+        _presynthesize_audio(question_data["question"])
+        db = get_db()
+        db.execute(
+            "UPDATE ai_interviews SET prefetched_question = ? WHERE id = ?",
+            (json.dumps({"context_key": context_key, "question_data": question_data}), interview_id)
+        )
+        db.commit()
+        db.close()
+        return question_data
+
+    task = asyncio.create_task(prefetch())
+    _prefetch_tasks[interview_id] = (context_key, task)
+
+    def forget(t):
+        if _prefetch_tasks.get(interview_id, (None, None))[1] is t:
+            del _prefetch_tasks[interview_id]
+        if not t.cancelled() and t.exception():
+            print(f"Question prefetch failed for interview {interview_id}: {t.exception()}")
+    task.add_done_callback(forget)
+
+
+async def _next_interview_question(interview, context_key: str, profile: dict, previous_qa: list,
+                                   question_number: int, on_delta=None) -> dict:
+    """Serve the prefetched question if its context still matches, otherwise generate it now."""
+    prefetched = None
+    inflight = _prefetch_tasks.get(interview["id"])
+    if inflight and inflight[0] == context_key:
+        try:
+            prefetched = await asyncio.shield(inflight[1])
+        except Exception:
+            pass
+    if prefetched is None and interview["prefetched_question"]:
+        stored = json.loads(interview["prefetched_question"])
+        if stored.get("context_key") == context_key:
+            prefetched = stored["question_data"]
+    if prefetched is not None:
+        if on_delta:
+            on_delta(prefetched["question"])
+        return prefetched
+    return await _generate_question_for(profile, previous_qa, question_number, on_delta)
+
+
+
+async def _start_interview(interview_id: int, on_delta=None) -> dict:
     """Start AI interview and get first question."""
     db = get_db()
     interview = db.execute("SELECT * FROM ai_interviews WHERE id = ?", (interview_id,)).fetchone()
@@ -718,31 +1314,31 @@ async def start_interview(interview_id: int):
         "SELECT * FROM candidates WHERE id = ?", (interview["candidate_id"],)
     ).fetchone()
 
-    skills = json.loads(candidate["skills"])
-    coding_platforms = json.loads(candidate["coding_platforms"]) if candidate["coding_platforms"] else {}
+    profile = _interview_profile(candidate, interview)
+    # Digest the resume once per interview; every question prompt reuses it
+    if INTERVIEW_PROMPT_TOKEN_BUDGET > 0:
+        profile["resume_digest"] = build_resume_digest(profile["resume_text"], profile["skills"])
+    profile["context_summary"] = []
 
     # Generate first question
-    question_data = await generate_interview_question(
-        skills=skills,
-        resume_text=candidate["resume_text"] or "",
-        previous_qa=[],
-        question_number=1,
-        total_questions=interview["total_questions"],
-        github_url=candidate["github_url"] or "",
-        coding_platforms=coding_platforms,
-    )
+    question_data = await _generate_question_for(profile, [], 1, on_delta)
+    audio_url = _presynthesize_audio(question_data["question"])
 
     qa_list = [{"question_data": question_data, "question": question_data["question"], "answer": None, "score": None, "evaluation": None}]
 
     now = datetime.utcnow().isoformat()
+    start_turns(db, interview_id, question_data)
     db.execute(
-        "UPDATE ai_interviews SET status = 'in_progress', start_time = ?, questions_answers = ?, current_question_index = 0 WHERE id = ?",
-        (now, json.dumps(qa_list), interview_id)
+        """UPDATE ai_interviews SET status = 'in_progress', start_time = ?, current_question_index = 0,
+           prefetched_question = NULL, resume_digest = ?, context_summary = '[]' WHERE id = ?""",
+        (now, profile["resume_digest"], interview_id)
     )
     db.execute("UPDATE candidates SET status = 'test2_in_progress' WHERE id = ?", (interview["candidate_id"],))
     db.commit()
     db.close()
 
+    _schedule_question_prefetch(interview_id, profile, qa_list, 2)
+
     return {
         "interview_id": interview_id,
         "question": question_data["question"],
@@ -750,11 +1346,11 @@ async def start_interview(interview_id: int):
         "difficulty": question_data.get("difficulty", "medium"),
         "question_number": 1,
         "total_questions": interview["total_questions"],
+        "audio_url": audio_url,
     }
 
 
-@app.post("/api/student/answer-interview")
-async def answer_interview(data: InterviewAnswer):
+async def _answer_interview(data: InterviewAnswer, on_delta=None) -> dict:
     """Submit answer and get next question or finish."""
     db = get_db()
     interview = db.execute("SELECT * FROM ai_interviews WHERE id = ?", (data.interview_id,)).fetchone()
@@ -766,41 +1362,54 @@ async def answer_interview(data: InterviewAnswer):
         "SELECT * FROM candidates WHERE id = ?", (data.candidate_id,)
     ).fetchone()
 
-    skills = json.loads(candidate["skills"])
-    coding_platforms = json.loads(candidate["coding_platforms"]) if candidate["coding_platforms"] else {}
+    profile = _interview_profile(candidate, interview)
+    skills = profile["skills"]
 
-    qa_list = json.loads(interview["questions_answers"])
+    qa_list = load_interview_qa(db, interview)
     current_idx = interview["current_question_index"]
+    next_idx = current_idx + 1
+    is_complete = next_idx >= interview["total_questions"]
 
-    # Evaluate the answer
+    # Evaluate the answer, and fetch the next question concurrently with it
     current_qa = qa_list[current_idx]
-    evaluation = await evaluate_interview_answer(
+    evaluation_call = evaluate_interview_answer(
         question=current_qa["question"],
         answer=data.answer,
         expected_key_points=current_qa.get("question_data", {}).get("expected_key_points", []),
         skill_category=current_qa.get("question_data", {}).get("category", "general"),
     )
+    try:
+        if is_complete:
+            evaluation = await evaluation_call
+        else:
+            context_key = _interview_context_key(qa_list, next_idx + 1)
+            answered_qa = qa_list[:current_idx] + [dict(current_qa, answer=data.answer)]
+            evaluation, question_data = await asyncio.gather(
+                evaluation_call,
+                _next_interview_question(interview, context_key, profile, answered_qa, next_idx + 1, on_delta),
+            )
+            audio_url = _presynthesize_audio(question_data["question"])
+    except LLM_ERRORS as e:
+        # Nothing is recorded, so the candidate can submit the same answer again
+        db.close()
+        print(f"Interview {data.interview_id} answer evaluation failed: {e}")
+        raise HTTPException(status_code=503, detail="Answer evaluation is temporarily unavailable. Please submit again.")
 
-    # Update current Q&A
+    # Record the answer on its own turn; a concurrent submission for the same turn loses
+    if not record_answer(db, data.interview_id, current_idx, data.answer, evaluation):
+        db.close()
+        raise HTTPException(status_code=409, detail="This question has already been answered")
     qa_list[current_idx]["answer"] = data.answer
     qa_list[current_idx]["score"] = evaluation.get("score", 5)
     qa_list[current_idx]["evaluation"] = evaluation
 
-    next_idx = current_idx + 1
-    is_complete = next_idx >= interview["total_questions"]
+    # Roll the answered turn into the compact context used by later question prompts
+    summary = profile["context_summary"][:current_idx]
+    summary += [summarize_interview_turn(qa, i + 1) for i, qa in enumerate(qa_list[:current_idx + 1]) if i >= len(summary)]
+    profile["context_summary"] = summary
+    db.execute("UPDATE ai_interviews SET context_summary = ? WHERE id = ?", (json.dumps(summary), data.interview_id))
 
     if not is_complete:
-        # Generate next question
-        question_data = await generate_interview_question(
-            skills=skills,
-            resume_text=candidate["resume_text"] or "",
-            previous_qa=qa_list,
-            question_number=next_idx + 1,
-            total_questions=interview["total_questions"],
-            github_url=candidate["github_url"] or "",
-            coding_platforms=coding_platforms,
-        )
-
         qa_list.append({
             "question_data": question_data,
             "question": question_data["question"],
@@ -809,13 +1418,16 @@ async def answer_interview(data: InterviewAnswer):
             "evaluation": None,
         })
 
+        append_turn(db, data.interview_id, next_idx, question_data)
         db.execute(
-            "UPDATE ai_interviews SET questions_answers = ?, current_question_index = ? WHERE id = ?",
-            (json.dumps(qa_list), next_idx, data.interview_id)
+            "UPDATE ai_interviews SET current_question_index = ?, prefetched_question = NULL WHERE id = ?",
+            (next_idx, data.interview_id)
         )
         db.commit()
         db.close()
 
+        _schedule_question_prefetch(data.interview_id, profile, qa_list, next_idx + 2)
+
         return {
             "evaluation": evaluation,
             "is_complete": False,
@@ -824,19 +1436,20 @@ async def answer_interview(data: InterviewAnswer):
             "next_difficulty": question_data.get("difficulty", "medium"),
             "question_number": next_idx + 1,
             "total_questions": interview["total_questions"],
+            "audio_url": audio_url,
         }
     else:
         # Interview complete - calculate overall score
         scores = [qa.get("score", 0) for qa in qa_list if qa.get("score") is not None]
         avg_score = sum(scores) / len(scores) if scores else 0
-        passed = any(qa.get("score", 0) >= 5 for qa in qa_list)  # Pass if at least 1 answer is good (>=5)
+        passed = any(score >= 5 for score in scores)  # Pass if at least 1 answer is good (>=5)
 
         now = datetime.utcnow().isoformat()
         status = "passed" if passed else "failed"
 
         db.execute(
-            "UPDATE ai_interviews SET questions_answers = ?, overall_score = ?, status = ?, end_time = ? WHERE id = ?",
-            (json.dumps(qa_list), avg_score, status, now, data.interview_id)
+            "UPDATE ai_interviews SET overall_score = ?, status = ?, end_time = ? WHERE id = ?",
+            (avg_score, status, now, data.interview_id)
         )
 
         candidate_status = "completed" if passed else "test2_failed"
@@ -882,38 +1495,46 @@ async def answer_interview(data: InterviewAnswer):
             ],
         }
 
-        report_data = await generate_final_report(
-            candidate_info={"name": candidate["name"], "skills": skills},
-            mcq_results=mcq_results,
-            coding_results=coding_results,
-            interview_results=interview_results,
-            proctoring_summary=proctoring_summary,
-        )
+        # Commit the interview outcome first: holding the write transaction open across
+        # the LLM call would lock every other writer (answers, proctoring logs) out
+        db.commit()
+
+        try:
+            report_data = await generate_final_report(
+                candidate_info={"name": candidate["name"], "skills": skills},
+                mcq_results=mcq_results,
+                coding_results=coding_results,
+                interview_results=interview_results,
+                proctoring_summary=proctoring_summary,
+            )
+        except LLM_ERRORS as e:
+            # The interview result is already saved; generate the report later, with retries
+            print(f"Report generation for candidate {data.candidate_id} failed: {e}; queued for retry")
+            enqueue_job("generate_report", {"candidate_id": data.candidate_id})
+            report_data = None
 
         # Save report
         test1_passed = mcq_results["passed"] and coding_results["passed"]
         overall_status = "passed" if test1_passed and passed else ("partial" if test1_passed or passed else "failed")
 
         try:
-            db.execute(
-                """INSERT OR REPLACE INTO reports
-                   (candidate_id, mcq_score, mcq_passed, coding_score, coding_passed, test1_passed,
-                    interview_score, interview_passed, overall_status, detailed_feedback, proctoring_summary)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    data.candidate_id,
-                    mcq_results["score"],
-                    mcq_results["passed"],
-                    coding_results["score"],
-                    coding_results["passed"],
-                    test1_passed,
-                    avg_score,
-                    passed,
-                    overall_status,
-                    json.dumps(report_data),
-                    json.dumps(proctoring_summary),
+            if report_data is not None:
+                db.execute(
+                    _report_insert_sql(report_data),
+                    (
+                        data.candidate_id,
+                        mcq_results["score"],
+                        mcq_results["passed"],
+                        coding_results["score"],
+                        coding_results["passed"],
+                        test1_passed,
+                        avg_score,
+                        passed,
+                        overall_status,
+                        json.dumps(report_data),
+                        json.dumps(proctoring_summary),
+                    )
                 )
-            )
         except:
             pass
 
@@ -929,6 +1550,69 @@ async def answer_interview(data: InterviewAnswer):
         }
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_interview_step(step):
+    """Run an interview step, forwarding question text as server-sent events.
+
+    Emits `question_delta` events ({"text": ...}) while the next question is
+    generated, then a single `result` event carrying the same payload as the
+    non-streaming endpoint, or an `error` event. The step is not cancelled if
+    the client disconnects, so a submitted answer is always recorded.
+    """
+    deltas = asyncio.Queue()
+    task = asyncio.ensure_future(step(deltas.put_nowait))
+    while True:
+        getter = asyncio.ensure_future(deltas.get())
+        done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+        if getter in done:
+            yield _sse("question_delta", {"text": getter.result()})
+            continue
+        getter.cancel()
+        break
+    while not deltas.empty():
+        yield _sse("question_delta", {"text": deltas.get_nowait()})
+    try:
+        yield _sse("result", task.result())
+    except HTTPException as e:
+        yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+    except Exception as e:
+        print(f"Interview stream error: {e}")
+        yield _sse("error", {"status_code": 500, "detail": "Interview step failed"})
+
+
+def _sse_response(events):
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/student/start-interview/{interview_id}")
+async def start_interview(interview_id: int):
+    return await _start_interview(interview_id)
+
+
+@app.post("/api/student/start-interview/{interview_id}/stream")
+async def start_interview_stream(interview_id: int):
+    """Start the interview, streaming the first question's text as it is generated."""
+    return _sse_response(_stream_interview_step(lambda on_delta: _start_interview(interview_id, on_delta)))
+
+
+@app.post("/api/student/answer-interview")
+async def answer_interview(data: InterviewAnswer):
+    return await _answer_interview(data)
+
+
+@app.post("/api/student/answer-interview/stream")
+async def answer_interview_stream(data: InterviewAnswer):
+    """Submit an answer, streaming the next question's text as it is generated."""
+    return _sse_response(_stream_interview_step(lambda on_delta: _answer_interview(data, on_delta)))
+
+
 # ──────────────── Proctoring Routes ────────────────
 
 @app.post("/api/proctoring/log")
@@ -972,64 +1656,238 @@ async def get_proctoring_logs(candidate_id: int):
 
 # ──────────────── Text-to-Speech (Deepgram) ────────────────
 
+DEEPGRAM_TTS_URL = "https://api.deepgram.com/v1/speak"
+TTS_DEFAULT_VOICE = os.getenv("TTS_VOICE", "aura-asteria-en")
+TTS_AUDIO_HEADERS = {"Content-Disposition": "inline; filename=tts_audio.mp3"}
+
+tts_cache_requests = metrics.counter("tts_cache_requests_total", "TTS requests by cache result")
+
+_tts_inflight = {}  # cache key -> task synthesizing that clip into the cache
+
+
+async def _open_deepgram_stream(text: str, voice: str):
+    """Start a streaming synthesis request; returns (client, response) once headers arrive."""
+    client = httpx.AsyncClient(timeout=30.0)
+    try:
+        request = client.build_request(
+            "POST", DEEPGRAM_TTS_URL,
+            params={"model": voice},
+            json={"text": text},
+            headers={"Authorization": f"Token {DEEPGRAM_API_KEY}", "Content-Type": "application/json"},
+        )
+        response = await client.send(request, stream=True)
+    except Exception:
+        await client.aclose()
+        raise
+    if response.status_code != 200:
+        body = await response.aread()
+        await response.aclose()
+        await client.aclose()
+        print(f"Deepgram TTS error: {response.status_code} - {body[:500]!r}")
+        raise HTTPException(status_code=502, detail="Deepgram TTS request failed")
+    return client, response
+
+
+async def _tee_to_cache(client, response, key: str):
+    """Forward Deepgram audio chunks as they arrive while writing them to the cache.
+
+    The clip is only published to the cache if the upstream stream completes;
+    a client disconnect or upstream error discards the partial file.
+    """
+    writer = tts_cache.CacheWriter(key)
+    try:
+        async for chunk in response.aiter_bytes():
+            writer.write(chunk)
+            yield chunk
+        writer.commit()
+    finally:
+        writer.abort()
+        await response.aclose()
+        await client.aclose()
+
+
+async def _synthesize_to_cache(text: str, voice: str, key: str):
+    client, response = await _open_deepgram_stream(text, voice)
+    async for _ in _tee_to_cache(client, response, key):
+        pass
+
+
+async def _wait_for_inflight_audio(key: str):
+    task = _tts_inflight.get(key)
+    if task is not None:
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            pass  # the caller falls back to synthesizing or a 404
+
+
+def _presynthesize_audio(text: str):
+    """Start synthesizing a question's audio into the cache; returns its URL, or None if TTS is off.
+
+    The clip is keyed exactly as POST /api/tts would key the same text, so a
+    client that falls back to /api/tts still hits the cache.
+    """
+    text = (text or "").strip()
+    if not DEEPGRAM_API_KEY or not text:
+        return None
+    key = tts_cache.cache_key(text, TTS_DEFAULT_VOICE)
+    if key not in _tts_inflight and not tts_cache.lookup(key):
+        task = asyncio.create_task(_synthesize_to_cache(text, TTS_DEFAULT_VOICE, key))
+        _tts_inflight[key] = task
+
+        def forget(t):
+            _tts_inflight.pop(key, None)
+            if not t.cancelled() and t.exception():
+                print(f"TTS pre-synthesis failed: {t.exception()}")
+        task.add_done_callback(forget)
+    return f"/api/tts/audio/{key}"
+
+
+@app.get("/api/tts/audio/{key}")
+async def get_tts_audio(key: str):
+    """Serve a pre-synthesized clip, waiting for it if synthesis is still running."""
+    if not re.fullmatch(r"[0-9a-f]{64}", key):
+        raise HTTPException(status_code=404, detail="Audio not found")
+    await _wait_for_inflight_audio(key)
+    cached_path = tts_cache.lookup(key)
+    if not cached_path:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    tts_cache_requests.inc(result="hit")
+    return FileResponse(cached_path, media_type="audio/mpeg", headers=TTS_AUDIO_HEADERS)
+
+
 @app.post("/api/tts")
 async def text_to_speech(req: TTSRequest):
-    """Convert text to speech using Deepgram's Aura TTS API."""
-    if not DEEPGRAM_API_KEY:
-        raise HTTPException(status_code=503, detail="Deepgram API key not configured")
-
+    """Convert text to speech using Deepgram's Aura TTS API, served from the disk cache when possible."""
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Text is required")
 
-    url = "https://api.deepgram.com/v1/speak?model=aura-asteria-en"
-    headers = {
-        "Authorization": f"Token {DEEPGRAM_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {"text": req.text.strip()}
+    text = req.text.strip()
+    voice = req.voice or TTS_DEFAULT_VOICE
+    key = tts_cache.cache_key(text, voice)
+
+    await _wait_for_inflight_audio(key)
+    cached_path = tts_cache.lookup(key)
+    if cached_path:
+        tts_cache_requests.inc(result="hit")
+        return FileResponse(cached_path, media_type="audio/mpeg", headers={**TTS_AUDIO_HEADERS, "X-TTS-Cache": "hit"})
+
+    if not DEEPGRAM_API_KEY:
+        raise HTTPException(status_code=503, detail="Deepgram API key not configured")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-
-            if response.status_code != 200:
-                print(f"Deepgram TTS error: {response.status_code} - {response.text}")
-                raise HTTPException(status_code=502, detail="Deepgram TTS request failed")
-
-            audio_bytes = BytesIO(response.content)
-            return StreamingResponse(
-                audio_bytes,
-                media_type="audio/mpeg",
-                headers={"Content-Disposition": "inline; filename=tts_audio.mp3"},
-            )
+        client, response = await _open_deepgram_stream(text, voice)
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Deepgram TTS request timed out")
     except Exception as e:
         print(f"TTS error: {e}")
         raise HTTPException(status_code=500, detail="TTS generation failed")
 
+    tts_cache_requests.inc(result="miss")
+    return StreamingResponse(
+        _tee_to_cache(client, response, key),
+        media_type="audio/mpeg",
+        headers={**TTS_AUDIO_HEADERS, "X-TTS-Cache": "miss"},
+    )
+
 
 # ──────────────── Report Routes ────────────────
 
+REPORT_SORT_COLUMNS = {
+    "generated_at": "r.generated_at",
+    "mcq_score": "COALESCE(r.mcq_score, 0)",
+    "coding_score": "COALESCE(r.coding_score, 0)",
+    "interview_score": "COALESCE(r.interview_score, 0)",
+}
+REPORT_SCORE_FIELDS = {"mcq_score", "coding_score", "interview_score"}
+REPORT_INCLUDES = {"feedback", "skills"}
+
+
+def _decode_report_feedback(r) -> dict:
+    return {
+        "detailed_feedback": json.loads(r["detailed_feedback"]) if r["detailed_feedback"] else {},
+        "proctoring_summary": json.loads(r["proctoring_summary"]) if r["proctoring_summary"] else {},
+    }
+
+
 @app.get("/api/admin/reports")
-async def get_all_reports():
+async def get_all_reports(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = "generated_at",
+    order: str = "desc",
+    overall_status: Optional[str] = None,
+    score_field: str = "interview_score",
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    include: Optional[str] = None,
+):
+    """List reports as compact score summaries, keyset-paginated on (sort, id).
+
+    The heavy detailed_feedback / proctoring_summary blobs are only read
+    when include=feedback is passed; otherwise fetch them per report from
+    /api/admin/reports/{report_id}/feedback.
+    """
+    if sort not in REPORT_SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(REPORT_SORT_COLUMNS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if score_field not in REPORT_SCORE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"score_field must be one of: {', '.join(sorted(REPORT_SCORE_FIELDS))}")
+    includes = {i.strip() for i in include.split(",") if i.strip()} if include else set()
+    if includes - REPORT_INCLUDES:
+        raise HTTPException(status_code=400, detail=f"include must be drawn from: {', '.join(sorted(REPORT_INCLUDES))}")
+
+    sort_expr = REPORT_SORT_COLUMNS[sort]
+    score_expr = REPORT_SORT_COLUMNS[score_field]
+    columns = [
+        "r.id", "r.candidate_id", "r.mcq_score", "r.mcq_passed", "r.coding_score", "r.coding_passed",
+        "r.test1_passed", "r.interview_score", "r.interview_passed", "r.overall_status", "r.generated_at",
+        "c.name", "c.email", "c.status AS candidate_status", f"{sort_expr} AS sort_key",
+    ]
+    if "feedback" in includes:
+        columns += ["r.detailed_feedback", "r.proctoring_summary"]
+    if "skills" in includes:
+        columns.append("c.skills")
+
+    where, params = [], []
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, 2)
+        where.append(f"({sort_expr}, r.id) {'<' if order == 'desc' else '>'} (?, ?)")
+        params.extend([last_key, last_id])
+    if overall_status:
+        where.append("r.overall_status = ?")
+        params.append(overall_status)
+    if min_score is not None:
+        where.append(f"{score_expr} >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        where.append(f"{score_expr} <= ?")
+        params.append(max_score)
+
+    sql = f"SELECT {', '.join(columns)} FROM reports r JOIN candidates c ON r.candidate_id = c.id"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    direction = "DESC" if order == "desc" else "ASC"
+    sql += f" ORDER BY {sort_expr} {direction}, r.id {direction} LIMIT ?"
+    params.append(limit + 1)
+
     db = get_db()
-    reports = db.execute("""
-        SELECT r.*, c.name, c.email, c.skills, c.status as candidate_status
-        FROM reports r
-        JOIN candidates c ON r.candidate_id = c.id
-        ORDER BY r.generated_at DESC
-    """).fetchall()
+    reports = db.execute(sql, params).fetchall()
     db.close()
 
+    has_more = len(reports) > limit
+    reports = reports[:limit]
     result = []
     for r in reports:
-        result.append({
+        item = {
             "id": r["id"],
             "candidate_id": r["candidate_id"],
             "candidate_name": r["name"],
             "candidate_email": r["email"],
-            "skills": json.loads(r["skills"]),
+            "candidate_status": r["candidate_status"],
             "mcq_score": r["mcq_score"],
             "mcq_passed": bool(r["mcq_passed"]),
             "coding_score": r["coding_score"],
@@ -1038,11 +1896,30 @@ async def get_all_reports():
             "interview_score": r["interview_score"],
             "interview_passed": bool(r["interview_passed"]),
             "overall_status": r["overall_status"],
-            "detailed_feedback": json.loads(r["detailed_feedback"]) if r["detailed_feedback"] else {},
-            "proctoring_summary": json.loads(r["proctoring_summary"]) if r["proctoring_summary"] else {},
             "generated_at": r["generated_at"],
-        })
-    return {"reports": result}
+        }
+        if "skills" in includes:
+            item["skills"] = json.loads(r["skills"]) if r["skills"] else []
+        if "feedback" in includes:
+            item.update(_decode_report_feedback(r))
+        result.append(item)
+
+    next_cursor = encode_cursor(reports[-1]["sort_key"], reports[-1]["id"]) if has_more else None
+    return {"reports": result, "next_cursor": next_cursor, "has_more": has_more}
+
+
+@app.get("/api/admin/reports/{report_id}/feedback")
+async def get_report_feedback(report_id: int):
+    """Load the detailed feedback and proctoring summary for one report."""
+    db = get_db()
+    r = db.execute(
+        "SELECT id, candidate_id, detailed_feedback, proctoring_summary FROM reports WHERE id = ?",
+        (report_id,)
+    ).fetchone()
+    db.close()
+    if not r:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return {"id": r["id"], "candidate_id": r["candidate_id"], **_decode_report_feedback(r)}
 
 
 @app.get("/api/admin/report/{candidate_id}")
@@ -1057,6 +1934,7 @@ async def get_candidate_report(candidate_id: int):
     interview = db.execute("SELECT * FROM ai_interviews WHERE candidate_id = ? ORDER BY created_at DESC LIMIT 1", (candidate_id,)).fetchone()
     mcq = db.execute("SELECT * FROM mcq_tests WHERE candidate_id = ? ORDER BY created_at DESC LIMIT 1", (candidate_id,)).fetchone()
     violations = db.execute("SELECT * FROM proctoring_logs WHERE candidate_id = ?", (candidate_id,)).fetchall()
+    interview_qa = load_interview_qa(db, interview) if interview else []
 
     db.close()
 
@@ -1070,7 +1948,7 @@ async def get_candidate_report(candidate_id: int):
             "linkedin_url": candidate["linkedin_url"],
             "coding_platforms": json.loads(candidate["coding_platforms"]) if candidate["coding_platforms"] else {},
         },
-        "interview_qa": json.loads(interview["questions_answers"]) if interview else [],
+        "interview_qa": interview_qa,
         "mcq_details": {
             "score": mcq["score"],
             "total": mcq["total_marks"],
@@ -1080,6 +1958,83 @@ async def get_candidate_report(candidate_id: int):
     }
 
 
+# ──────────────── Streaming Export ────────────────
+
+def _export_response(chunks, basename: str, fmt: str, compress: bool):
+    if compress:
+        chunks = gzip_chunks(chunks)
+    ext = "csv" if fmt == "csv" else "ndjson"
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"{basename}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{ext}"
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@app.get("/api/admin/export/candidates")
+async def export_candidates(
+    format: str = "csv",
+    gzip: bool = False,
+    status: Optional[str] = None,
+):
+    """Stream every candidate (without resume_text) as CSV or NDJSON."""
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+
+    where, params = [], []
+    if status:
+        where.append("status = ?")
+        params.append(status)
+
+    batches = iter_batches(
+        f"SELECT {', '.join(CANDIDATE_EXPORT_COLUMNS)} FROM candidates", where, params,
+        [("created_at", "created_at"), ("id", "id")],
+    )
+    if format == "csv":
+        chunks = csv_chunks(batches, candidate_record, CANDIDATE_EXPORT_COLUMNS)
+    else:
+        chunks = ndjson_chunks(batches, candidate_record)
+    return _export_response(chunks, "candidates", format, gzip)
+
+
+@app.get("/api/admin/export/reports")
+async def export_reports(
+    format: str = "csv",
+    gzip: bool = False,
+    overall_status: Optional[str] = None,
+    include_feedback: bool = False,
+):
+    """Stream every report joined with its candidate as CSV or NDJSON."""
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+
+    columns = "r.*, c.name, c.email" if include_feedback else (
+        "r.id, r.candidate_id, r.mcq_score, r.mcq_passed, r.coding_score, r.coding_passed, "
+        "r.test1_passed, r.interview_score, r.interview_passed, r.overall_status, r.generated_at, c.name, c.email"
+    )
+    where, params = [], []
+    if overall_status:
+        where.append("r.overall_status = ?")
+        params.append(overall_status)
+
+    batches = iter_batches(
+        f"SELECT {columns} FROM reports r JOIN candidates c ON r.candidate_id = c.id", where, params,
+        [("r.generated_at", "generated_at"), ("r.id", "id")],
+    )
+    to_record = lambda row: report_record(row, include_feedback)
+    if format == "csv":
+        columns = REPORT_EXPORT_COLUMNS + (REPORT_FEEDBACK_COLUMNS if include_feedback else [])
+        chunks = csv_chunks(batches, to_record, columns)
+    else:
+        chunks = ndjson_chunks(batches, to_record)
+    return _export_response(chunks, "reports", format, gzip)
+
+
 # ──────────────── Dashboard Stats ────────────────
 
 @app.get("/api/admin/dashboard")
@@ -1132,22 +2087,28 @@ async def reset_database():
         # Some tables might not exist - just ignore
         db.rollback()
         # Try simpler approach
-        for table in ["proctoring_logs", "reports", "ai_interviews", "coding_tests", "mcq_tests", "candidates"]:
+        for table in ["proctoring_logs", "reports", "interview_turns", "ai_interviews", "coding_tests", "mcq_tests", "candidates"]:
             try:
                 db.execute(f"DELETE FROM {table}")
             except:
                 pass
         db.commit()
     finally:
+        # Every blob left without a candidate goes too
+        resume_store.collect_garbage(db, UPLOAD_DIR)
         db.close()
 
-    # Clean uploaded files
-    import glob
-    for f in glob.glob(os.path.join(UPLOAD_DIR, "*")):
-        try:
-            os.remove(f)
-        except:
-            pass
+    # Legacy flat uploads, and temp files left by interrupted uploads; a recent
+    # .part file may belong to an upload that is still streaming in
+    stale_before = time.time() - UPLOAD_TEMP_MAX_AGE_SECONDS
+    for entry in os.scandir(UPLOAD_DIR):
+        if entry.is_file():
+            if entry.name.endswith(".part") and entry.stat().st_mtime > stale_before:
+                continue
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
 
     return {"success": True, "message": "Database reset successfully"}
 
@@ -1492,9 +2453,21 @@ async def finish_sql_test(candidate_id: int):
 
 # ──────────────── On-Demand Report Generation ────────────────
 
-@app.post("/api/admin/generate-report/{candidate_id}")
-async def generate_report_for_candidate(candidate_id: int):
-    """Generate report for any candidate, regardless of status."""
+def _report_insert_sql(report_data: dict) -> str:
+    """Upsert for a candidate's report; a fallback placeholder never replaces a stored report."""
+    verb = "INSERT OR IGNORE" if report_data.get("fallback") else "INSERT OR REPLACE"
+    return f"""{verb} INTO reports
+               (candidate_id, mcq_score, mcq_passed, coding_score, coding_passed, test1_passed,
+                interview_score, interview_passed, overall_status, detailed_feedback, proctoring_summary)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+async def _generate_report(candidate_id: int) -> dict:
+    """Generate and store the assessment report for one candidate.
+
+    Cerebras errors (LLM_ERRORS) propagate: the endpoint turns them into a
+    503 and the background job retries them.
+    """
     db = get_db()
     candidate = db.execute("SELECT * FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
     if not candidate:
@@ -1539,15 +2512,19 @@ async def generate_report_for_candidate(candidate_id: int):
         "highlights": [],
     }
 
-    if interview and interview["questions_answers"]:
-        qa_list = json.loads(interview["questions_answers"])
+    if interview:
+        qa_list = load_interview_qa(db, interview)
         interview_results["highlights"] = [
             {"q": qa["question"][:100], "score": qa.get("score", 0)}
             for qa in qa_list[:5] if qa.get("question")
         ]
 
+    # Don't hold the connection open across the LLM call
+    candidate_name = candidate["name"]
+    db.close()
+
     report_data = await generate_final_report(
-        candidate_info={"name": candidate["name"], "skills": skills},
+        candidate_info={"name": candidate_name, "skills": skills},
         mcq_results=mcq_results,
         coding_results=coding_results,
         interview_results=interview_results,
@@ -1563,12 +2540,10 @@ async def generate_report_for_candidate(candidate_id: int):
     else:
         overall_status = "failed"
 
+    db = get_db()
     try:
         db.execute(
-            """INSERT OR REPLACE INTO reports
-               (candidate_id, mcq_score, mcq_passed, coding_score, coding_passed, test1_passed,
-                interview_score, interview_passed, overall_status, detailed_feedback, proctoring_summary)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            _report_insert_sql(report_data),
             (
                 candidate_id,
                 mcq_results["score"],
@@ -1596,6 +2571,76 @@ async def generate_report_for_candidate(candidate_id: int):
     }
 
 
+@app.post("/api/admin/generate-report/{candidate_id}")
+async def generate_report_for_candidate(candidate_id: int, background: bool = False):
+    """Generate report for any candidate, regardless of status.
+
+    With background=true the work is queued and a job id is returned
+    immediately; poll /api/admin/jobs/{job_id} for the result.
+    """
+    if background:
+        _require_candidate(candidate_id)
+        job_id = enqueue_job("generate_report", {"candidate_id": candidate_id})
+        return {"success": True, "job_id": job_id, "status": "queued"}
+    try:
+        return await _generate_report(candidate_id)
+    except LLM_ERRORS as e:
+        print(f"Report generation for candidate {candidate_id} failed: {e}")
+        raise HTTPException(status_code=503, detail="Report generation is temporarily unavailable. Please try again.")
+
+
+# ──────────────── Background Jobs ────────────────
+
+def _require_candidate(candidate_id: int):
+    db = get_db()
+    exists = db.execute("SELECT 1 FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+    db.close()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+
+@job_handler("generate_test")
+async def _generate_test_job(payload: dict) -> dict:
+    try:
+        return await _generate_test(payload["candidate_id"])
+    except HTTPException as e:
+        raise JobFailed(e.detail)
+
+
+@job_handler("generate_report")
+async def _generate_report_job(payload: dict) -> dict:
+    try:
+        return await _generate_report(payload["candidate_id"])
+    except HTTPException as e:
+        raise JobFailed(e.detail)
+
+
+@app.get("/api/admin/jobs")
+async def get_jobs(status: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    return {"jobs": list_jobs(status, limit)}
+
+
+@app.get("/api/admin/jobs/{job_id}")
+async def get_job_status(job_id: int):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# ──────────────── Metrics ────────────────
+
+@app.get("/api/admin/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (text exposition format)."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 # ──────────────── Health Check ────────────────
 
 @app.get("/api/health")
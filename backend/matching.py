@@ -0,0 +1,169 @@
+import os
+import re
+import math
+import json
+import asyncio
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from starlette.concurrency import run_in_threadpool
+
+from database import get_db
+from resume_parser import ResumeParser
+
+# Share of the score that comes from extracted skills vs. the rest of the resume text
+MATCH_SKILL_WEIGHT = float(os.getenv("MATCH_SKILL_WEIGHT", "0.7"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset("""
+    a an and are as at be been by for from has have in is it its of on or our that the their this to was
+    were will with we you your i my me he she they them his her not but also into over under than then
+    experience work worked working using used use team years year role responsibilities
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class MatchIndex:
+    """TF-IDF vectors for every candidate, one row per candidate.
+
+    Columns are the skill vocabulary followed by the text vocabulary. Each
+    row's skill block and text block are L2-normalised separately and scaled
+    by MATCH_SKILL_WEIGHT / (1 - MATCH_SKILL_WEIGHT), so a single sparse
+    matrix-vector product gives the weighted sum of both cosine similarities.
+    """
+
+    def __init__(self, rows: list, signature: tuple):
+        self.signature = signature
+        self.ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.skills = [set(s) for _, s, _ in rows]
+
+        skill_docs = [Counter(s) for _, s, _ in rows]
+        text_docs = [Counter(tokenize(text)) for _, _, text in rows]
+        self.skill_vocab, self.skill_idf = self._vocabulary(skill_docs)
+        self.term_vocab, self.term_idf = self._vocabulary(text_docs)
+
+        skill_block = self._weigh(skill_docs, self.skill_vocab, self.skill_idf)
+        text_block = self._weigh(text_docs, self.term_vocab, self.term_idf)
+        self.matrix = sparse.hstack([
+            MATCH_SKILL_WEIGHT * skill_block,
+            (1 - MATCH_SKILL_WEIGHT) * text_block,
+        ], format="csr")
+
+    @staticmethod
+    def _vocabulary(docs: list) -> tuple:
+        df = Counter()
+        for doc in docs:
+            df.update(doc.keys())
+        vocab = {term: i for i, term in enumerate(sorted(df))}
+        n = len(docs)
+        idf = np.ones(len(vocab))
+        for term, i in vocab.items():
+            idf[i] = math.log((1 + n) / (1 + df[term])) + 1
+        return vocab, idf
+
+    @staticmethod
+    def _weigh(docs: list, vocab: dict, idf: np.ndarray) -> sparse.csr_matrix:
+        """Sublinear tf * idf, L2-normalised per row."""
+        indptr, indices, data = [0], [], []
+        for doc in docs:
+            cols = [vocab[t] for t in doc if t in vocab]
+            values = np.array([1 + math.log(doc[t]) for t in doc if t in vocab]) * idf[cols] if cols else np.array([])
+            norm = np.linalg.norm(values)
+            indices.extend(cols)
+            data.extend(values / norm if norm else values)
+            indptr.append(len(indices))
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(docs), len(vocab)))
+
+    def query_vector(self, skills: list, text: str) -> np.ndarray:
+        """The job description in the same space (blocks normalised, not weighted)."""
+        vector = np.zeros(self.matrix.shape[1])
+        offset = len(self.skill_vocab)
+        for terms, vocab, idf, start in (
+            (Counter(skills), self.skill_vocab, self.skill_idf, 0),
+            (Counter(tokenize(text)), self.term_vocab, self.term_idf, offset),
+        ):
+            cols = [vocab[t] for t in terms if t in vocab]
+            if not cols:
+                continue
+            values = np.array([1 + math.log(terms[t]) for t in terms if t in vocab]) * idf[cols]
+            vector[np.array(cols) + start] = values / np.linalg.norm(values)
+        return vector
+
+    def top_k(self, skills: list, text: str, k: int, allowed_ids=None) -> list:
+        """[(candidate_id, score, matched skills)] best first, scores in [0, 1]."""
+        if not len(self.ids):
+            return []
+        scores = self.matrix @ self.query_vector(skills, text)
+        if allowed_ids is not None:
+            scores = np.where(np.isin(self.ids, list(allowed_ids)), scores, -1.0)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.lexsort((-self.ids[best], -scores[best]))]
+        wanted = set(skills)
+        return [
+            (int(self.ids[i]), float(scores[i]), sorted(self.skills[i] & wanted))
+            for i in best if scores[i] > 0
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()  # one build at a time
+_rebuild_task = None  # background rebuild after the candidate set changed
+
+
+def index_signature(db) -> tuple:
+    """Changes whenever a candidate is added or removed (ids are AUTOINCREMENT, never reused)."""
+    row = db.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM candidates").fetchone()
+    return (row[0], row[1])
+
+
+def _build_index(force: bool = False) -> MatchIndex:
+    """Read every candidate and build the index; blocking, so run it in a worker thread."""
+    global _index
+    with _index_lock:
+        db = get_db()
+        try:
+            signature = index_signature(db)
+            if not force and _index is not None and _index.signature == signature:
+                return _index
+            rows = [
+                (r["id"], [s.lower() for s in json.loads(r["skills"] or "[]")], r["resume_text"] or "")
+                for r in db.execute("SELECT id, skills, resume_text FROM candidates ORDER BY id")
+            ]
+        finally:
+            db.close()
+        _index = MatchIndex(rows, signature)
+        return _index
+
+
+def _rebuild_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        print(f"Match index rebuild failed: {task.exception()}")
+
+
+async def get_index(db, refresh: bool = False) -> MatchIndex:
+    """The cached index, kept in step with the candidate set off the event loop.
+
+    Only the first build and refresh=True are waited for. When candidates
+    have been added or removed since the last build, a rebuild starts in the
+    background and the previous index keeps being served until it is done.
+    """
+    global _rebuild_task
+    if refresh or _index is None:
+        return await run_in_threadpool(_build_index, refresh)
+    if _index.signature != index_signature(db) and (_rebuild_task is None or _rebuild_task.done()):
+        _rebuild_task = asyncio.ensure_future(run_in_threadpool(_build_index))
+        _rebuild_task.add_done_callback(_rebuild_done)
+    return _index
+
+
+def job_skills(job_description: str, skills: list = None) -> list:
+    """Requested skills, or the ones ResumeParser finds in the job description."""
+    if skills:
+        return sorted({s.strip().lower() for s in skills if s.strip()})
+    return ResumeParser.extract_skills(job_description or "")
@@ -0,0 +1,142 @@
+import threading
+
+
+class Counter:
+    """Monotonic counter with optional labels, e.g. counter.inc(5, mode="compact")."""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def items(self) -> list:
+        with self._lock:
+            return list(self._values.items())
+
+    def snapshot(self) -> list:
+        return [{"labels": dict(key), "value": value} for key, value in self.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, e.g. requests currently in flight."""
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels, e.g. latency.observe(0.42, purpose="mcq")."""
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, name: str, help: str, buckets: tuple = None):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self._values = {}  # labels -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += 1
+            entry[-1] += value
+
+    def items(self) -> list:
+        with self._lock:
+            return [(key, list(entry)) for key, entry in self._values.items()]
+
+    def snapshot(self) -> list:
+        return [
+            {
+                "labels": dict(key),
+                "buckets": {str(bound): entry[i] for i, bound in enumerate(self.buckets)},
+                "count": entry[-2],
+                "sum": round(entry[-1], 6),
+            }
+            for key, entry in self.items()
+        ]
+
+
+_registry = {}
+
+
+def counter(name: str, help: str) -> Counter:
+    """Get or create a process-wide counter."""
+    if name not in _registry:
+        _registry[name] = Counter(name, help)
+    return _registry[name]
+
+
+def gauge(name: str, help: str) -> Gauge:
+    """Get or create a process-wide gauge."""
+    if name not in _registry:
+        _registry[name] = Gauge(name, help)
+    return _registry[name]
+
+
+def histogram(name: str, help: str, buckets: tuple = None) -> Histogram:
+    """Get or create a process-wide histogram."""
+    if name not in _registry:
+        _registry[name] = Histogram(name, help, buckets)
+    return _registry[name]
+
+
+def snapshot() -> dict:
+    """JSON-friendly view of every registered metric."""
+    return {
+        name: {"type": type(metric).__name__.lower(), "help": metric.help, "values": metric.snapshot()}
+        for name, metric in sorted(_registry.items())
+    }
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """Every registered metric in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name, metric in sorted(_registry.items()):
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {type(metric).__name__.lower()}")
+        if isinstance(metric, Histogram):
+            for key, entry in metric.items():
+                for i, bound in enumerate(metric.buckets):
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_value(float(bound))),))} {entry[i]}")
+                lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {entry[-2]}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(entry[-1])}")
+                lines.append(f"{name}_count{_format_labels(key)} {entry[-2]}")
+        else:
+            for key, value in metric.items():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,12 @@
 import sqlite3
 import os
+import json
+import hashlib
+
+import resume_store
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "skillproctor.db")
+UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 
 def migrate():
     try:
@@ -25,5 +30,78 @@ def migrate():
     except Exception as e:
         print(f"Migration failed: {e}")
 
+def backfill_interview_turns():
+    """Copy legacy questions_answers blobs into interview_turns (run after init_db)."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        rows = cursor.execute("""
+            SELECT id, questions_answers FROM ai_interviews
+            WHERE questions_answers IS NOT NULL AND questions_answers != '[]'
+              AND id NOT IN (SELECT DISTINCT interview_id FROM interview_turns)
+        """).fetchall()
+        for interview_id, blob in rows:
+            for idx, qa in enumerate(json.loads(blob)):
+                cursor.execute(
+                    """INSERT INTO interview_turns (interview_id, turn_index, question, question_data, answer, score, evaluation)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        interview_id, idx, qa.get("question", ""),
+                        json.dumps(qa.get("question_data") or {}), qa.get("answer"), qa.get("score"),
+                        json.dumps(qa["evaluation"]) if qa.get("evaluation") is not None else None,
+                    )
+                )
+        conn.commit()
+        print(f"Backfilled interview turns for {len(rows)} interviews.")
+        conn.close()
+    except Exception as e:
+        print(f"Interview turn backfill failed: {e}")
+
+def backfill_resume_blobs():
+    """Move legacy "{timestamp}_{filename}" uploads into the content-addressed store (run after init_db)."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        rows = conn.execute(
+            "SELECT id, resume_path FROM candidates WHERE resume_sha256 IS NULL AND resume_path IS NOT NULL AND resume_path != ''"
+        ).fetchall()
+        moved = missing = 0
+        for candidate_id, path in rows:
+            if not os.path.isfile(path):
+                missing += 1
+                continue
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+            blob_path = resume_store.put_blob(conn, UPLOAD_DIR, path, sha256, os.path.getsize(path))
+            conn.execute(
+                "UPDATE candidates SET resume_sha256 = ?, resume_path = ? WHERE id = ?",
+                (sha256, blob_path, candidate_id)
+            )
+            resume_store.release_blob(conn, sha256)
+            conn.commit()
+            moved += 1
+        print(f"Moved {moved} resumes into the content-addressed store ({missing} files missing).")
+        conn.close()
+    except Exception as e:
+        print(f"Resume blob backfill failed: {e}")
+
+def rebuild_resume_search_index():
+    """Rebuild candidates_fts from candidates (run after init_db, or to repair the index)."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('optimize')")
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        print(f"Rebuilt the resume search index for {count} candidates.")
+        conn.close()
+    except Exception as e:
+        print(f"Resume search index rebuild failed: {e}")
+
 if __name__ == "__main__":
     migrate()
+    backfill_interview_turns()
+    backfill_resume_blobs()
+    rebuild_resume_search_index()
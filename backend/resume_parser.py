@@ -1,7 +1,56 @@
+import io
+import os
 import re
 import json
+import mmap
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from PyPDF2 import PdfReader
 
+# Pages beyond this are ignored so a 200-page upload cannot tie up the parser
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "30"))
+# Long CVs have their remaining pages extracted by a process pool (0 or 1 worker = serial)
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+RESUME_PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", "8"))
+
+# A first-page match this far from the end of the page cannot change once
+# later pages are appended, so cheap fields can be read from page one alone
+_PAGE_END_MARGIN = 64
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _open_reader(source) -> PdfReader:
+    if isinstance(source, (bytes, bytearray)):
+        return PdfReader(io.BytesIO(source))
+    # PdfReader(path) reads the whole file into a BytesIO; a read-only map
+    # lets the OS page it in instead
+    with open(source, "rb") as f:
+        return PdfReader(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _extract_page_range(source, start: int, stop: int) -> list:
+    """Text of pages [start, stop); runs inside the worker processes."""
+    reader = _open_reader(source)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _worker_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=RESUME_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _join_pages(pages) -> str:
+    return "\n".join(text for text in pages if text).strip()
+
 
 class ResumeParser:
     """Extract skills, URLs, and profile information from resumes."""
@@ -75,33 +124,80 @@ class ResumeParser:
         "authentication", "authorization", "sso", "ldap", "active-directory",
     }
 
+    EMAIL_PATTERN = r'[\w\.\-\+]+@[\w\.\-]+\.\w+'
+    PHONE_PATTERNS = [
+        r'[\+]?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
+        r'\+?\d{10,13}',
+    ]
+    GITHUB_PATTERNS = [
+        r'https?://(?:www\.)?github\.com/[\w\-]+',
+        r'github\.com/[\w\-]+',
+    ]
+    LINKEDIN_PATTERNS = [
+        r'https?://(?:www\.)?linkedin\.com/in/[\w\-]+',
+        r'linkedin\.com/in/[\w\-]+',
+    ]
+
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> str:
+    def iter_page_texts(source, max_pages: int = None):
+        """Yield the text of each page in order, for a file path or PDF bytes.
+
+        Page one is extracted in-process and yielded straight away. When the
+        document has at least RESUME_PARALLEL_MIN_PAGES pages, the rest are
+        handed to the worker pool before that, so they are extracted while
+        the caller works on page one.
+        """
+        reader = _open_reader(source)
+        total = len(reader.pages)
+        count = min(total, max_pages or RESUME_MAX_PAGES)
+        if total > count:
+            print(f"Resume has {total} pages; extracting the first {count}")
+        if count == 0:
+            return
+
+        chunks = []
+        if RESUME_PARSE_WORKERS > 1 and count >= RESUME_PARALLEL_MIN_PAGES:
+            step = -(-(count - 1) // RESUME_PARSE_WORKERS)
+            try:
+                pool = _worker_pool()
+                for start in range(1, count, step):
+                    stop = min(count, start + step)
+                    chunks.append((start, stop, pool.submit(_extract_page_range, source, start, stop)))
+            except Exception as e:
+                print(f"Resume worker pool unavailable, extracting serially: {e}")
+                chunks = []
+
+        try:
+            yield reader.pages[0].extract_text() or ""
+            if not chunks:
+                for i in range(1, count):
+                    yield reader.pages[i].extract_text() or ""
+                return
+            for start, stop, future in chunks:
+                try:
+                    texts = future.result()
+                except Exception as e:
+                    print(f"Resume worker failed on pages {start}-{stop - 1}, extracting serially: {e}")
+                    texts = [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+                yield from texts
+        finally:
+            for _, _, future in chunks:
+                future.cancel()
+
+    @classmethod
+    def extract_text_from_pdf(cls, file_path: str, max_pages: int = None) -> str:
         """Extract text content from a PDF file."""
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text.strip()
+            return _join_pages(cls.iter_page_texts(file_path, max_pages))
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
             return ""
 
-    @staticmethod
-    def extract_text_from_bytes(file_bytes) -> str:
+    @classmethod
+    def extract_text_from_bytes(cls, file_bytes, max_pages: int = None) -> str:
         """Extract text content from PDF bytes."""
-        import io
         try:
-            reader = PdfReader(io.BytesIO(file_bytes))
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text.strip()
+            return _join_pages(cls.iter_page_texts(file_bytes, max_pages))
         except Exception as e:
             print(f"Error extracting PDF text from bytes: {e}")
             return ""
@@ -146,11 +242,7 @@ class ResumeParser:
     @staticmethod
     def extract_github_url(text: str) -> str:
         """Extract GitHub profile URL from text."""
-        patterns = [
-            r'https?://(?:www\.)?github\.com/[\w\-]+',
-            r'github\.com/[\w\-]+',
-        ]
-        for pattern in patterns:
+        for pattern in ResumeParser.GITHUB_PATTERNS:
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 url = match.group(0)
@@ -162,11 +254,7 @@ class ResumeParser:
     @staticmethod
     def extract_linkedin_url(text: str) -> str:
         """Extract LinkedIn profile URL from text."""
-        patterns = [
-            r'https?://(?:www\.)?linkedin\.com/in/[\w\-]+',
-            r'linkedin\.com/in/[\w\-]+',
-        ]
-        for pattern in patterns:
+        for pattern in ResumeParser.LINKEDIN_PATTERNS:
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 url = match.group(0)
@@ -230,18 +318,13 @@ class ResumeParser:
     @staticmethod
     def extract_email(text: str) -> str:
         """Extract email address from text."""
-        pattern = r'[\w\.\-\+]+@[\w\.\-]+\.\w+'
-        match = re.search(pattern, text)
+        match = re.search(ResumeParser.EMAIL_PATTERN, text)
         return match.group(0) if match else ""
 
     @staticmethod
     def extract_phone(text: str) -> str:
         """Extract phone number from text."""
-        patterns = [
-            r'[\+]?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
-            r'\+?\d{10,13}',
-        ]
-        for pattern in patterns:
+        for pattern in ResumeParser.PHONE_PATTERNS:
             match = re.search(pattern, text)
             if match:
                 return match.group(0).strip()
@@ -260,25 +343,63 @@ class ResumeParser:
         return "Unknown Candidate"
 
     @classmethod
-    def parse_resume(cls, file_path: str = None, file_bytes=None) -> dict:
+    def _first_page_fields(cls, page: str) -> dict:
+        """Contact fields whose value is already final after page one.
+
+        Only the first pattern of each extractor counts (a later pattern's
+        page-one hit could lose to an earlier pattern's hit on a later page),
+        and only when the match ends well clear of the page end.
+        """
+        def settled(pattern, flags=0):
+            match = re.search(pattern, page, flags)
+            if match and len(page) - match.end() >= _PAGE_END_MARGIN:
+                return match.group(0)
+            return None
+
+        fields = {}
+        if len(page.strip().split('\n')) >= 5:
+            fields["name"] = cls.extract_name(page)
+        email = settled(cls.EMAIL_PATTERN)
+        if email:
+            fields["email"] = email
+        phone = settled(cls.PHONE_PATTERNS[0])
+        if phone:
+            fields["phone"] = phone.strip()
+        github = settled(cls.GITHUB_PATTERNS[0], re.IGNORECASE)
+        if github:
+            fields["github_url"] = github
+        linkedin = settled(cls.LINKEDIN_PATTERNS[0], re.IGNORECASE)
+        if linkedin:
+            fields["linkedin_url"] = linkedin
+        return fields
+
+    @classmethod
+    def parse_resume(cls, file_path: str = None, file_bytes=None, max_pages: int = None) -> dict:
         """Parse a resume and extract all relevant information."""
-        if file_path:
-            text = cls.extract_text_from_pdf(file_path)
-        elif file_bytes:
-            text = cls.extract_text_from_bytes(file_bytes)
-        else:
+        source = file_path if file_path else file_bytes
+        if not source:
             return {"error": "No file provided"}
 
+        try:
+            pages = cls.iter_page_texts(source, max_pages)
+            first_page = next(pages, "")
+            # Resolved while the worker pool (if any) extracts the other pages
+            fields = cls._first_page_fields(first_page)
+            text = _join_pages([first_page, *pages])
+        except Exception as e:
+            print(f"Error extracting PDF text: {e}")
+            text = ""
+
         if not text:
             return {"error": "Could not extract text from resume"}
 
         return {
-            "name": cls.extract_name(text),
-            "email": cls.extract_email(text),
-            "phone": cls.extract_phone(text),
+            "name": fields["name"] if "name" in fields else cls.extract_name(text),
+            "email": fields.get("email") or cls.extract_email(text),
+            "phone": fields.get("phone") or cls.extract_phone(text),
             "skills": cls.extract_skills(text),
-            "github_url": cls.extract_github_url(text),
-            "linkedin_url": cls.extract_linkedin_url(text),
+            "github_url": fields.get("github_url") or cls.extract_github_url(text),
+            "linkedin_url": fields.get("linkedin_url") or cls.extract_linkedin_url(text),
             "coding_platforms": cls.extract_coding_platforms(text),
             "resume_text": text,
         }
@@ -0,0 +1,66 @@
+import os
+from datetime import datetime
+
+
+def blob_path(root: str, sha256: str) -> str:
+    """Where a resume with this content hash lives: <root>/ab/cd/abcd....pdf."""
+    return os.path.join(root, sha256[:2], sha256[2:4], f"{sha256}.pdf")
+
+
+def put_blob(db, root: str, temp_path: str, sha256: str, size: int) -> str:
+    """Move an uploaded temp file into the store, or drop it if the content is already there.
+
+    Takes a reference on the blob for the caller, so collect_garbage cannot
+    remove it while the upload is still being parsed. The candidates
+    triggers add the row's own reference; the caller then gives up its one
+    with release_blob, whether or not a candidate ended up pointing at it.
+    """
+    path = blob_path(root, sha256)
+    if os.path.exists(path):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+    db.execute(
+        """INSERT INTO resume_blobs (sha256, size, refcount, created_at) VALUES (?, ?, 1, ?)
+           ON CONFLICT(sha256) DO UPDATE SET refcount = refcount + 1""",
+        (sha256, size, datetime.utcnow().isoformat())
+    )
+    return path
+
+
+def release_blob(db, sha256: str):
+    """Give up the reference taken by put_blob. Does not commit or delete anything."""
+    db.execute("UPDATE resume_blobs SET refcount = refcount - 1 WHERE sha256 = ?", (sha256,))
+
+
+def collect_garbage(db, root: str, sha256: str = None) -> int:
+    """Delete unreferenced blobs (optionally just one) and their files. Returns the number removed.
+
+    Commits, since the rows must be gone before the files are.
+    """
+    query = "SELECT sha256 FROM resume_blobs WHERE refcount <= 0"
+    params = ()
+    if sha256:
+        query += " AND sha256 = ?"
+        params = (sha256,)
+    orphans = [row[0] for row in db.execute(query, params).fetchall()]
+    if not orphans:
+        return 0
+    db.executemany("DELETE FROM resume_blobs WHERE sha256 = ? AND refcount <= 0", [(s,) for s in orphans])
+    db.commit()
+
+    for digest in orphans:
+        path = blob_path(root, digest)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        # Drop the shard directories once they are empty (never root itself)
+        inner = os.path.dirname(path)
+        for directory in (inner, os.path.dirname(inner)):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+    return len(orphans)
@@ -0,0 +1,102 @@
+import os
+import uuid
+import hashlib
+import threading
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.path.dirname(__file__), "tts_cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+_lock = threading.Lock()
+_total_bytes = None  # lazily computed from disk, then kept up to date on writes
+
+
+def cache_key(text: str, voice: str) -> str:
+    """Content address for a synthesized clip."""
+    return hashlib.sha256(f"{voice}\n{text}".encode()).hexdigest()
+
+
+def _path_for(key: str) -> str:
+    return os.path.join(TTS_CACHE_DIR, key[:2], f"{key}.mp3")
+
+
+def lookup(key: str):
+    """Return the cached file path for a key, or None. A hit refreshes its LRU position."""
+    path = _path_for(key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def _cached_files():
+    for root, _, files in os.walk(TTS_CACHE_DIR):
+        for name in files:
+            if name.endswith(".mp3"):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+
+def _enforce_limit(added: int):
+    """Account for a new file and evict least-recently-used clips while over the limit."""
+    global _total_bytes
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = sum(size for _, size, _ in _cached_files())
+        else:
+            _total_bytes += added
+        if _total_bytes <= TTS_CACHE_MAX_BYTES:
+            return
+        files = sorted(_cached_files(), key=lambda f: f[2])
+        _total_bytes = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if _total_bytes <= TTS_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                _total_bytes -= size
+            except FileNotFoundError:
+                pass
+
+
+class CacheWriter:
+    """Write a clip to a private temp file and publish it atomically on commit.
+
+    Concurrent misses for the same key each write their own temp file; the
+    last rename wins and readers never see a partial clip.
+    """
+
+    def __init__(self, key: str):
+        self.path = _path_for(key)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._tmp_path = f"{self.path}.{uuid.uuid4().hex}.part"
+        self._file = open(self._tmp_path, "wb")
+        self._size = 0
+        self._done = False
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def commit(self):
+        self._file.close()
+        self._done = True
+        if self._size == 0:
+            os.remove(self._tmp_path)
+            return
+        os.replace(self._tmp_path, self.path)
+        _enforce_limit(self._size)
+
+    def abort(self):
+        if self._done:
+            return
+        self._done = True
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
@@ -11,15 +11,47 @@ export const uploadResume = (formData) =>
     API.post('/admin/upload-resume', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
     });
-export const getCandidates = () => API.get('/admin/candidates');
+export const getCandidates = (params = {}) => API.get('/admin/candidates', { params });
 export const getCandidate = (id) => API.get(`/admin/candidates/${id}`);
 export const deleteCandidate = (id) => API.delete(`/admin/candidates/${id}`);
-export const generateTest = (candidateId) => API.post(`/admin/generate-test/${candidateId}`);
+export const generateTest = (candidateId, params = {}) => API.post(`/admin/generate-test/${candidateId}`, null, { params });
+// Streams NDJSON progress events from the bulk generator to onEvent
+export const bulkGenerateTests = async (body, onEvent) => {
+    const response = await fetch('/api/admin/bulk/generate-tests', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body),
+    });
+    if (!response.ok) throw new Error(`Bulk generation failed (${response.status})`);
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(Boolean).forEach(line => onEvent(JSON.parse(line)));
+    }
+};
 export const getDashboard = () => API.get('/admin/dashboard');
-export const getAllReports = () => API.get('/admin/reports');
+export const getAllReports = (params = {}) => API.get('/admin/reports', { params });
+export const getReportFeedback = (reportId) => API.get(`/admin/reports/${reportId}/feedback`);
 export const getCandidateReport = (id) => API.get(`/admin/report/${id}`);
 export const resetDatabase = () => API.post('/admin/reset-database');
-export const generateReport = (candidateId) => API.post(`/admin/generate-report/${candidateId}`);
+export const generateReport = (candidateId, params = {}) => API.post(`/admin/generate-report/${candidateId}`, null, { params });
+export const getJob = (jobId) => API.get(`/admin/jobs/${jobId}`);
+
+// Poll a background job until it finishes; resolves with the job result
+export const waitForJob = async (jobId, intervalMs = 2000) => {
+    for (;;) {
+        const { data } = await getJob(jobId);
+        if (data.status === 'succeeded') return data.result;
+        if (data.status === 'failed') throw new Error(data.error || 'Job failed');
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+};
 
 // ──── Candidate APIs ────
 export const candidateLogin = (data) => API.post('/candidate/login', data);
@@ -44,6 +76,39 @@ export const finishSQL = (candidateId) => API.post(`/student/finish-sql/${candid
 export const startInterview = (interviewId) => API.post(`/student/start-interview/${interviewId}`);
 export const answerInterview = (data) => API.post('/student/answer-interview', data);
 
+// Reads the SSE stream of an interview step: onDelta receives question text
+// as it is generated; resolves with the final result payload.
+const streamInterviewStep = async (path, body, onDelta) => {
+    const response = await fetch(`/api${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: body ? JSON.stringify(body) : undefined,
+    });
+    if (!response.ok) throw new Error(`Interview request failed (${response.status})`);
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop();
+        for (const frame of frames) {
+            const event = frame.match(/^event: (.*)$/m)?.[1];
+            const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || 'null');
+            if (event === 'question_delta') onDelta(data.text);
+            if (event === 'result') return data;
+            if (event === 'error') throw new Error(data.detail);
+        }
+    }
+    throw new Error('Interview stream ended unexpectedly');
+};
+export const startInterviewStream = (interviewId, onDelta) =>
+    streamInterviewStep(`/student/start-interview/${interviewId}/stream`, null, onDelta);
+export const answerInterviewStream = (data, onDelta) =>
+    streamInterviewStep('/student/answer-interview/stream', data, onDelta);
+
 // ──── TTS API ────
 export const textToSpeech = (text) => API.post('/tts', { text }, { responseType: 'blob' });
 
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef, useCallback, Suspense } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { startInterview, answerInterview, textToSpeech } from '../api';
+import { startInterviewStream, answerInterviewStream, textToSpeech } from '../api';
 import ProctoringGuard from '../components/ProctoringGuard';
 import Avatar3D from '../components/Avatar3D';
 import { Send, Brain, MessageCircle, Mic, MicOff, Volume2, VolumeX, Loader } from 'lucide-react';
@@ -111,7 +111,15 @@ export default function AIInterview() {
         try {
             setLoading(true);
             setIsThinking(true);
-            const { data } = await startInterview(interviewId);
+            let streamed = '';
+            const data = await startInterviewStream(interviewId, (text) => {
+                // Show the question while it is still being generated
+                streamed += text;
+                const content = streamed;
+                setLoading(false);
+                setIsThinking(false);
+                setChatHistory([{ type: 'ai', content }]);
+            });
             setIsThinking(false);
 
             if (data.completed) {
@@ -127,7 +135,7 @@ export default function AIInterview() {
             if (data.question) {
                 const msg = { type: 'ai', content: data.question };
                 setChatHistory([msg]);
-                speakText(data.question);
+                speakText(data.question, data.audio_url);
             }
         } catch (error) {
             console.error(error);
@@ -154,7 +162,8 @@ export default function AIInterview() {
         setIsSpeaking(false);
     };
 
-    const speakText = async (text) => {
+    // audioUrl is the server's pre-synthesized clip for a question, if it returned one
+    const speakText = async (text, audioUrl = null) => {
         if (!ttsEnabled) return;
 
         // Increment ID to invalidate any pending requests
@@ -162,14 +171,23 @@ export default function AIInterview() {
         stopTTS();
 
         try {
-            // Call Deepgram TTS via backend
-            const { data: audioBlob } = await textToSpeech(text);
+            let url = audioUrl;
+            if (!url) {
+                // Call Deepgram TTS via backend
+                const { data: audioBlob } = await textToSpeech(text);
 
-            // If a newer request started while fetching, ignore this one
-            if (currentId !== speakIdRef.current) return;
+                // If a newer request started while fetching, ignore this one
+                if (currentId !== speakIdRef.current) return;
 
-            const url = URL.createObjectURL(audioBlob);
-            blobUrlRef.current = url;
+                url = URL.createObjectURL(audioBlob);
+                blobUrlRef.current = url;
+            }
+            const releaseUrl = () => {
+                if (url === blobUrlRef.current) {
+                    URL.revokeObjectURL(url);
+                    blobUrlRef.current = null;
+                }
+            };
 
             const audio = new Audio(url);
             audioRef.current = audio;
@@ -178,15 +196,15 @@ export default function AIInterview() {
             audio.onended = () => {
                 if (currentId !== speakIdRef.current) return;
                 setIsSpeaking(false);
-                URL.revokeObjectURL(url);
-                blobUrlRef.current = null;
+                releaseUrl();
             };
             audio.onerror = () => {
                 if (currentId !== speakIdRef.current) return;
                 setIsSpeaking(false);
-                URL.revokeObjectURL(url);
-                blobUrlRef.current = null;
-                browserSpeak(text);
+                releaseUrl();
+                // A missing pre-synthesized clip falls back to on-demand TTS first
+                if (audioUrl) speakText(text);
+                else browserSpeak(text);
             };
 
             await audio.play();
@@ -246,46 +264,58 @@ export default function AIInterview() {
         setChatHistory(prev => [...prev, { type: 'user', content: userAnswer }]);
 
         try {
-            const { data: result } = await answerInterview({
+            let streamed = '';
+            const result = await answerInterviewStream({
                 interview_id: interviewId,
                 candidate_id: candidateRef.current.id,
                 answer: userAnswer
-            });
-
-            // Wait a bit for effect
-            setTimeout(() => {
+            }, (text) => {
+                // Stream the next question into the chat as it is generated
+                streamed += text;
+                const message = { type: 'ai', content: streamed, streaming: true };
                 setIsThinking(false);
-                setSubmitting(false);
+                setChatHistory(prev => [...prev.filter(m => !m.streaming), message]);
+            });
 
-                // Show feedback
-                if (result.feedback) {
-                    setChatHistory(prev => [...prev, { type: 'feedback', content: 'Feedback', feedback: result.feedback, score: result.score }]);
+            setIsThinking(false);
+            setSubmitting(false);
 
-                    // Update Emotion based on score
-                    if (result.score >= 7) setAvatarEmotion('happy');
-                    else if (result.score <= 4) setAvatarEmotion('concerned');
-                    else setAvatarEmotion('neutral');
-                }
+            const evaluation = result.evaluation || {};
+            const feedback = evaluation.feedback ?? result.feedback;
+            const score = evaluation.score ?? result.score;
+            const isComplete = result.completed || result.is_complete;
+
+            // Feedback on this answer goes before the next question, which may already have streamed in
+            setChatHistory(prev => {
+                const history = prev.filter(m => !m.streaming);
+                if (feedback) history.push({ type: 'feedback', content: 'Feedback', feedback, score });
+                if (!isComplete && result.next_question) history.push({ type: 'ai', content: result.next_question });
+                return history;
+            });
 
-                if (result.completed) {
-                    setTimeout(() => navigate('/candidate/portal'), 3000);
-                } else if (result.next_question) {
-                    // Next Question
-                    setTimeout(() => {
-                        setQuestionData(prev => ({ ...prev, ...result }));
-                        setQuestionNum(prev => prev + 1);
-                        setChatHistory(prev => [...prev, { type: 'ai', content: result.next_question }]);
-                        speakText(result.next_question);
-                        setAvatarEmotion('neutral');
-                    }, 2000);
-                }
-            }, 1000);
+            // Update Emotion based on score (unscored answers leave it neutral)
+            if (score == null) setAvatarEmotion('neutral');
+            else if (score >= 7) setAvatarEmotion('happy');
+            else if (score <= 4) setAvatarEmotion('concerned');
+            else setAvatarEmotion('neutral');
+
+            if (isComplete) {
+                setTimeout(() => navigate('/candidate/portal'), 3000);
+            } else if (result.next_question) {
+                // Next Question
+                setQuestionData(prev => ({ ...prev, ...result }));
+                setQuestionNum(prev => prev + 1);
+                speakText(result.next_question, result.audio_url);
+            }
 
         } catch (error) {
             console.error(error);
             setIsThinking(false);
             setSubmitting(false);
-            alert("Failed to submit answer");
+            // Nothing was recorded: drop any partly streamed question and let the candidate resubmit
+            setChatHistory(prev => prev.filter(m => !m.streaming));
+            setAnswer(userAnswer);
+            alert(error.message || "Failed to submit answer");
         }
     };
 
@@ -385,12 +415,14 @@ export default function AIInterview() {
                                     }}>
                                         <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginBottom: '0.5rem' }}>
                                             <span style={{ fontSize: '0.75rem', fontWeight: 700, color: 'var(--accent-secondary)' }}>📊 FEEDBACK</span>
-                                            <span style={{
-                                                fontSize: '1rem', fontWeight: 800,
-                                                color: msg.score >= 7 ? 'var(--accent-success)' : msg.score >= 5 ? 'var(--accent-warning)' : 'var(--accent-danger)'
-                                            }}>
-                                                {msg.score}/10
-                                            </span>
+                                            {msg.score != null && (
+                                                <span style={{
+                                                    fontSize: '1rem', fontWeight: 800,
+                                                    color: msg.score >= 7 ? 'var(--accent-success)' : msg.score >= 5 ? 'var(--accent-warning)' : 'var(--accent-danger)'
+                                                }}>
+                                                    {msg.score}/10
+                                                </span>
+                                            )}
                                         </div>
                                         <p style={{ fontSize: '0.9rem', color: 'var(--text-secondary)', lineHeight: 1.6 }}>{msg.feedback}</p>
                                     </div>
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { getCandidate, generateTest } from '../api';
+import { getCandidate, generateTest, waitForJob } from '../api';
 import { ArrowLeft, Github, Linkedin, Code, Play, CheckCircle, XCircle, Clock, AlertTriangle } from 'lucide-react';
 import Toast from '../components/Toast';
 
@@ -28,11 +28,12 @@ export default function CandidateDetail() {
     const handleGenerateTest = async () => {
         setGenerating(true);
         try {
-            await generateTest(id);
+            const res = await generateTest(id, { background: true });
+            await waitForJob(res.data.job_id);
             setToast({ message: 'Test generated successfully!', type: 'success' });
             loadCandidate();
         } catch (err) {
-            setToast({ message: err.response?.data?.detail || 'Failed', type: 'error' });
+            setToast({ message: err.response?.data?.detail || err.message || 'Failed', type: 'error' });
         } finally {
             setGenerating(false);
         }
@@ -1,16 +1,19 @@
 import { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getCandidates, uploadResume, generateTest, deleteCandidate, generateReport } from '../api';
-import { Upload, Search, Trash2, Play, Eye, Plus, FileText, X, FileBarChart } from 'lucide-react';
+import { getCandidates, uploadResume, generateTest, deleteCandidate, generateReport, waitForJob, bulkGenerateTests } from '../api';
+import { Upload, Search, Trash2, Play, Eye, Plus, FileText, X, FileBarChart, Layers } from 'lucide-react';
 import Toast from '../components/Toast';
 
 export default function CandidateManagement() {
     const [candidates, setCandidates] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [showUpload, setShowUpload] = useState(false);
     const [uploading, setUploading] = useState(false);
     const [generating, setGenerating] = useState(null);
     const [generatingReport, setGeneratingReport] = useState(null);
+    const [bulkProgress, setBulkProgress] = useState(null);
     const [toast, setToast] = useState(null);
     const [search, setSearch] = useState('');
     const [uploadData, setUploadData] = useState({ name: '', email: '', file: null });
@@ -18,12 +21,23 @@ export default function CandidateManagement() {
     const fileRef = useRef();
     const navigate = useNavigate();
 
-    useEffect(() => { loadCandidates(); }, []);
+    const latestRequest = useRef(0);
+
+    // Search runs on the server, so it also finds candidates on pages not loaded yet
+    useEffect(() => {
+        const timer = setTimeout(loadCandidates, search ? 300 : 0);
+        return () => clearTimeout(timer);
+    }, [search]);
+
+    const listParams = (params = {}) => (search.trim() ? { ...params, q: search.trim() } : params);
 
     const loadCandidates = async () => {
+        const request = ++latestRequest.current;
         try {
-            const res = await getCandidates();
+            const res = await getCandidates(listParams());
+            if (request !== latestRequest.current) return; // a newer search has been sent
             setCandidates(res.data.candidates);
+            setNextCursor(res.data.next_cursor);
         } catch (err) {
             console.error(err);
         } finally {
@@ -31,6 +45,22 @@ export default function CandidateManagement() {
         }
     };
 
+    const loadMoreCandidates = async () => {
+        if (!nextCursor) return;
+        const request = latestRequest.current;
+        setLoadingMore(true);
+        try {
+            const res = await getCandidates(listParams({ cursor: nextCursor }));
+            if (request !== latestRequest.current) return;
+            setCandidates(prev => [...prev, ...res.data.candidates]);
+            setNextCursor(res.data.next_cursor);
+        } catch (err) {
+            console.error(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleUpload = async (e) => {
         e.preventDefault();
         if (!uploadData.file) return setToast({ message: 'Please select a PDF file', type: 'error' });
@@ -56,16 +86,36 @@ export default function CandidateManagement() {
     const handleGenerateTest = async (candidateId) => {
         setGenerating(candidateId);
         try {
-            const res = await generateTest(candidateId);
-            setToast({ message: `Test generated! MCQ: ${res.data.mcq_count} questions, Coding: ${res.data.coding_count} problems`, type: 'success' });
+            const res = await generateTest(candidateId, { background: true });
+            const result = await waitForJob(res.data.job_id);
+            setToast({ message: `Test generated! MCQ: ${result.mcq_count} questions, Coding: ${result.coding_count} problems`, type: 'success' });
             loadCandidates();
         } catch (err) {
-            setToast({ message: err.response?.data?.detail || 'Failed to generate test', type: 'error' });
+            setToast({ message: err.response?.data?.detail || err.message || 'Failed to generate test', type: 'error' });
         } finally {
             setGenerating(null);
         }
     };
 
+    const handleBulkGenerate = async () => {
+        if (!confirm('Generate tests for all pending candidates?')) return;
+        setBulkProgress({ done: 0, total: 0 });
+        try {
+            await bulkGenerateTests({ status: 'pending' }, (event) => {
+                if (event.event === 'started') setBulkProgress({ done: 0, total: event.total });
+                if (event.event === 'candidate') setBulkProgress({ done: event.done, total: event.total });
+                if (event.event === 'finished') {
+                    setToast({ message: `Bulk generation done: ${event.generated} generated, ${event.failed} failed, ${event.skipped} skipped`, type: event.failed ? 'error' : 'success' });
+                }
+            });
+            loadCandidates();
+        } catch (err) {
+            setToast({ message: err.message || 'Bulk generation failed', type: 'error' });
+        } finally {
+            setBulkProgress(null);
+        }
+    };
+
     const handleDelete = async (id) => {
         if (!confirm('Are you sure you want to delete this candidate?')) return;
         try {
@@ -80,11 +130,12 @@ export default function CandidateManagement() {
     const handleGenerateReport = async (candidateId) => {
         setGeneratingReport(candidateId);
         try {
-            const res = await generateReport(candidateId);
-            setToast({ message: `Report generated! Status: ${res.data.overall_status}`, type: 'success' });
+            const res = await generateReport(candidateId, { background: true });
+            const result = await waitForJob(res.data.job_id);
+            setToast({ message: `Report generated! Status: ${result.overall_status}`, type: 'success' });
             navigate(`/admin/reports/${candidateId}`);
         } catch (err) {
-            setToast({ message: err.response?.data?.detail || 'Failed to generate report', type: 'error' });
+            setToast({ message: err.response?.data?.detail || err.message || 'Failed to generate report', type: 'error' });
         } finally {
             setGeneratingReport(null);
         }
@@ -106,11 +157,6 @@ export default function CandidateManagement() {
         return map[status] || 'badge-pending';
     };
 
-    const filtered = candidates.filter(c =>
-        c.name.toLowerCase().includes(search.toLowerCase()) ||
-        c.email.toLowerCase().includes(search.toLowerCase())
-    );
-
     return (
         <div className="animate-fade-in">
             {toast && <Toast {...toast} onClose={() => setToast(null)} />}
@@ -120,9 +166,14 @@ export default function CandidateManagement() {
                     <h2>Candidates</h2>
                     <p>Manage candidates and generate assessments</p>
                 </div>
-                <button className="btn btn-primary" onClick={() => { setShowUpload(true); setParsedSkills(null); setUploadData({ name: '', email: '', file: null }); }}>
-                    <Plus size={18} /> Upload Resume
-                </button>
+                <div style={{ display: 'flex', gap: '0.5rem' }}>
+                    <button className="btn btn-secondary" onClick={handleBulkGenerate} disabled={!!bulkProgress}>
+                        {bulkProgress ? <><span className="loading-spinner" /> {bulkProgress.done}/{bulkProgress.total}</> : <><Layers size={18} /> Generate All Pending</>}
+                    </button>
+                    <button className="btn btn-primary" onClick={() => { setShowUpload(true); setParsedSkills(null); setUploadData({ name: '', email: '', file: null }); }}>
+                        <Plus size={18} /> Upload Resume
+                    </button>
+                </div>
             </div>
 
             {/* Search */}
@@ -131,7 +182,7 @@ export default function CandidateManagement() {
                 <input
                     className="form-input"
                     style={{ paddingLeft: '2.5rem' }}
-                    placeholder="Search candidates..."
+                    placeholder="Search by name, email or skill..."
                     value={search}
                     onChange={(e) => setSearch(e.target.value)}
                 />
@@ -142,7 +193,7 @@ export default function CandidateManagement() {
                 <div className="text-center" style={{ padding: '3rem' }}>
                     <div className="loading-spinner" />
                 </div>
-            ) : filtered.length > 0 ? (
+            ) : candidates.length > 0 ? (
                 <div className="table-container">
                     <table className="table">
                         <thead>
@@ -156,7 +207,7 @@ export default function CandidateManagement() {
                             </tr>
                         </thead>
                         <tbody>
-                            {filtered.map(c => (
+                            {candidates.map(c => (
                                 <tr key={c.id}>
                                     <td style={{ fontFamily: 'var(--font-mono)', fontWeight: 600 }}>#{c.id}</td>
                                     <td style={{ fontWeight: 600 }}>{c.name}</td>
@@ -212,6 +263,13 @@ export default function CandidateManagement() {
                             ))}
                         </tbody>
                     </table>
+                    {nextCursor && (
+                        <div className="text-center" style={{ padding: '1rem' }}>
+                            <button className="btn btn-sm btn-outline" onClick={loadMoreCandidates} disabled={loadingMore}>
+                                {loadingMore ? <span className="loading-spinner" /> : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             ) : (
                 <div className="empty-state">
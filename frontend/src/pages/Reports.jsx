@@ -5,7 +5,9 @@ import { FileText, Eye, CheckCircle, XCircle, Minus } from 'lucide-react';
 
 export default function Reports() {
     const [reports, setReports] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const navigate = useNavigate();
 
     useEffect(() => { loadReports(); }, []);
@@ -14,6 +16,7 @@ export default function Reports() {
         try {
             const res = await getAllReports();
             setReports(res.data.reports);
+            setNextCursor(res.data.next_cursor);
         } catch (err) {
             console.error(err);
         } finally {
@@ -21,6 +24,20 @@ export default function Reports() {
         }
     };
 
+    const loadMoreReports = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const res = await getAllReports({ cursor: nextCursor });
+            setReports(prev => [...prev, ...res.data.reports]);
+            setNextCursor(res.data.next_cursor);
+        } catch (err) {
+            console.error(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const StatusIcon = ({ passed }) => {
         if (passed === true) return <CheckCircle size={16} style={{ color: 'var(--accent-success)' }} />;
         if (passed === false) return <XCircle size={16} style={{ color: 'var(--accent-danger)' }} />;
@@ -92,6 +109,13 @@ export default function Reports() {
                             ))}
                         </tbody>
                     </table>
+                    {nextCursor && (
+                        <div className="text-center" style={{ padding: '1rem' }}>
+                            <button className="btn btn-sm btn-outline" onClick={loadMoreReports} disabled={loadingMore}>
+                                {loadingMore ? <span className="loading-spinner" /> : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             ) : (
                 <div className="empty-state">